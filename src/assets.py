@@ -0,0 +1,71 @@
+import os
+import json
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+
+MANIFEST_NAME = "asset-manifest.json"
+HASH_LENGTH = 10
+
+
+def fingerprinted_name(rel, fingerprint):
+    """images/tom.png -> images/tom.<fingerprint>.png"""
+    root, ext = os.path.splitext(rel)
+    return f"{root}.{fingerprint}{ext}"
+
+
+class AssetMap:
+    """
+    Maps static outputs (relative to the output directory) to their
+    content-hashed names, and root-relative URLs to the hashed URLs, with
+    one dict lookup per URL. key identifies the whole mapping; key_for()
+    identifies just the part of it a page references.
+    """
+
+    def __init__(self, names):
+        self.names = dict(sorted(names.items()))
+        self.urls = {"/" + rel.replace(os.sep, "/"): "/" + hashed.replace(os.sep, "/")
+                     for rel, hashed in self.names.items()}
+        self.key = hashlib.sha1(json.dumps(self.names).encode("utf-8")).hexdigest()
+
+    def name(self, rel):
+        return self.names.get(rel, rel)
+
+    def url(self, path):
+        return self.urls.get(path, path)
+
+    def key_for(self, urls):
+        """
+        Identifies the hashed names of the assets among urls (query strings
+        and fragments aside), so a page keyed on it is rebuilt only when an
+        asset it references changes.
+        """
+        used = {}
+        for url in urls:
+            path = url.split("#", 1)[0].split("?", 1)[0]
+            if path in self.urls:
+                used[path] = self.urls[path]
+        return hashlib.sha1(json.dumps(sorted(used.items())).encode("utf-8")).hexdigest()
+
+    def manifest(self):
+        """The asset-manifest.json text: logical name -> hashed name."""
+        return json.dumps({rel.replace(os.sep, "/"): hashed.replace(os.sep, "/") for rel, hashed in self.names.items()},
+                          indent=1, sort_keys=True)
+
+
+def fingerprint_static(files, digest, params_for=None, workers=None):
+    """
+    Hashes static files in parallel and returns their AssetMap. files is a
+    list of (source path, output rel) pairs, digest(path) returns a
+    source's sha256 (e.g. DependencyGraph.digest, which reuses known
+    digests), and params_for(rel) the processing applied to an output
+    (e.g. minification), which is folded into its fingerprint.
+    """
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        digests = list(pool.map(digest, [src for src, _ in files]))
+    names = {}
+    for (_, rel), sha256 in zip(files, digests):
+        params = params_for(rel) if params_for is not None else None
+        if params:
+            sha256 = hashlib.sha256(f"{sha256}:{json.dumps(params, sort_keys=True)}".encode("utf-8")).hexdigest()
+        names[rel] = fingerprinted_name(rel, sha256[:HASH_LENGTH])
+    return AssetMap(names)
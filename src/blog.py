@@ -0,0 +1,275 @@
+import os
+import json
+import html
+import hashlib
+from htmlnode import ParentNode, LeafNode
+from inline_markdown import (
+    BlockType,
+    block_to_block_type,
+    markdown_to_blocks,
+    text_to_textnodes,
+    extract_title,
+)
+from frontmatter import split_front_matter
+from textnode import TextType
+from output import DirectoryOutput
+from minify import minify_html_chunks
+from depgraph import file_digest
+from changes import added_dates
+
+INDEX_NAME = ".blog-index.json"
+INDEX_VERSION = 2
+SUMMARY_LENGTH = 200
+FEED_SIZE = 20
+
+
+def page_url(rel_path):
+    """URL of the page generated from a content-relative markdown path."""
+    rel_path = rel_path.replace(os.sep, "/")
+    if rel_path == "index.md":
+        return "/"
+    if rel_path.endswith("/index.md"):
+        return "/" + rel_path[: -len("index.md")]
+    return "/" + rel_path[: -len(".md")] + ".html"
+
+
+def summarize(markdown):
+    """Plain text of the first paragraph with prose, cut at a word boundary."""
+    for block in markdown_to_blocks(markdown):
+        if block_to_block_type(block) != BlockType.PARAGRAPH:
+            continue
+        try:
+            nodes = text_to_textnodes(block.replace("\n", " "))
+        except ValueError:
+            continue
+        # skip navigation-only paragraphs such as "[< Back Home](/)"
+        if not any(node.text_type != TextType.LINK and node.text_type != TextType.IMAGE and node.text.strip()
+                   for node in nodes):
+            continue
+        text = "".join(node.text for node in nodes if node.text_type != TextType.IMAGE).strip()
+        if len(text) > SUMMARY_LENGTH:
+            text = text[:SUMMARY_LENGTH].rsplit(" ", 1)[0] + "…"
+        return text
+    return ""
+
+
+def post_paths(blog_dir):
+    """Paths of the posts under blog_dir: its markdown files other than index.md."""
+    paths = []
+    for root, dirs, files in os.walk(blog_dir):
+        dirs.sort()
+        for f in sorted(files):
+            path = os.path.join(root, f)
+            if f.endswith(".md") and path != os.path.join(blog_dir, "index.md"):
+                paths.append(path)
+    return paths
+
+
+def listing_pages(blog_dir, blog_section="blog", page_size=10):
+    """The listing pages build_blog generates for blog_dir, relative to the output directory."""
+    count = -(-len(post_paths(blog_dir)) // page_size)
+    pages = [f"{blog_section}/page/{number}/index.html" for number in range(1, count + 1)]
+    if not os.path.exists(os.path.join(blog_dir, "index.md")):
+        pages.append(f"{blog_section}/index.html")
+    return pages
+
+
+def post_metadata(markdown, url, fallback_date):
+    """Title, date, path and summary of a post, from one read of its source."""
+    meta, body = split_front_matter(markdown)
+    try:
+        title = meta.get("title") or extract_title(body)
+    except ValueError:
+        title = url
+    return {
+        "title": title,
+        "date": meta.get("date", fallback_date)[:10],
+        "url": url,
+        "summary": meta.get("summary") or summarize(body),
+    }
+
+
+def update_post_index(content_dir, blog_dir, out_dir, output=None, digest_source=None):
+    """
+    Brings the metadata index in out_dir/.blog-index.json up to date and
+    returns (posts sorted oldest first, number of posts re-read).
+
+    Posts are the markdown files under blog_dir other than its index.md.
+    Unchanged posts (same digest_source(path), by default their sha256)
+    are taken from the index without parsing them, so adding one post to a
+    large blog parses one file; with DependencyGraph.digest, posts git
+    reports unchanged are not even opened. A post without a front matter date is
+    dated by the commit that added it, or left undated outside git.
+    output is the backend out_dir is written through (see output.py).
+    """
+    output = output or DirectoryOutput(out_dir)
+    digest_source = digest_source or file_digest
+    data = output.read(INDEX_NAME)
+    index = json.loads(data) if data is not None else {}
+    if index.get("version") != INDEX_VERSION:
+        index = {"version": INDEX_VERSION, "posts": {}}
+    old_posts = index["posts"]
+    posts = {}
+    undated = {}
+    reread = 0
+    for path in post_paths(blog_dir):
+        rel = os.path.relpath(path, content_dir).replace(os.sep, "/")
+        sha256 = digest_source(path)
+        entry = old_posts.get(rel)
+        if entry is None or entry["sha256"] != sha256:
+            with open(path, "r", encoding="utf-8") as fh:
+                markdown = fh.read()
+            entry = post_metadata(markdown, page_url(rel), "")
+            entry["sha256"] = sha256
+            reread += 1
+        if not entry["date"]:
+            undated[path] = rel
+        posts[rel] = entry
+    dated = 0
+    if undated:
+        dates = added_dates(content_dir, list(undated))
+        for path, rel in undated.items():
+            date = dates.get(os.path.realpath(path))
+            if date:
+                posts[rel] = dict(posts[rel], date=date)
+                dated += 1
+    # the index is build state: backends that keep none (archives) skip it
+    if output.incremental and (reread or dated or len(posts) != len(old_posts)):
+        index["posts"] = posts
+        output.write(INDEX_NAME, [json.dumps(index, indent=1, sort_keys=True)])
+    ordered = sorted(posts.values(), key=lambda post: (post["date"], post["url"]))
+    return ordered, reread
+
+
+def digest(data):
+    return hashlib.sha1(json.dumps(data, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def listing_node(title, posts, resolve_url, older=None, newer=None):
+    """HTML node for a listing page of posts (given newest first)."""
+    items = []
+    for post in posts:
+        item = [LeafNode("a", html.escape(post["title"]), {"href": resolve_url(post["url"])})]
+        if post["date"]:
+            item += [LeafNode(None, " "), LeafNode("time", post["date"], {"datetime": post["date"]})]
+        item.append(LeafNode("p", html.escape(post["summary"])))
+        items.append(ParentNode("li", item))
+    children = [LeafNode("h1", html.escape(title)), ParentNode("ul", items) if items else LeafNode("p", "No posts yet.")]
+    nav = []
+    if newer:
+        nav.append(LeafNode("a", "Newer posts", {"href": resolve_url(newer), "rel": "prev"}))
+    if older:
+        nav.append(LeafNode("a", "Older posts", {"href": resolve_url(older), "rel": "next"}))
+    if nav:
+        children.append(ParentNode("nav", nav))
+    return ParentNode("div", children)
+
+
+def sitemap_xml(urls, site_url, lastmods):
+    lines = ['<?xml version="1.0" encoding="UTF-8"?>',
+             '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">']
+    for url in urls:
+        lastmod = lastmods.get(url)
+        lines.append(f"<url><loc>{html.escape(site_url + url)}</loc>"
+                     + (f"<lastmod>{lastmod}</lastmod>" if lastmod else "") + "</url>")
+    lines.append("</urlset>")
+    return "\n".join(lines) + "\n"
+
+
+def atom_feed(posts, site_url, title, feed_url, home_url):
+    """Atom feed of posts (given newest first). Undated posts carry the feed's date."""
+    updated = max([post["date"] for post in posts if post["date"]] or ["1970-01-01"]) + "T00:00:00Z"
+    lines = ['<?xml version="1.0" encoding="utf-8"?>',
+             '<feed xmlns="http://www.w3.org/2005/Atom">',
+             f"<title>{html.escape(title)}</title>",
+             f'<link href="{html.escape(site_url + home_url)}"/>',
+             f'<link rel="self" href="{html.escape(site_url + feed_url)}"/>',
+             f"<id>{html.escape(site_url + home_url)}</id>",
+             f"<updated>{updated}</updated>"]
+    for post in posts:
+        link = html.escape(site_url + post["url"])
+        lines.append("<entry>"
+                     f"<title>{html.escape(post['title'])}</title>"
+                     f'<link href="{link}"/>'
+                     f"<id>{link}</id>"
+                     f"<updated>{post['date'] + 'T00:00:00Z' if post['date'] else updated}</updated>"
+                     f"<summary>{html.escape(post['summary'])}</summary>"
+                     "</entry>")
+    lines.append("</feed>")
+    return "\n".join(lines) + "\n"
+
+
+def build_blog(content_dir, out_dir, page_urls, template, template_path, resolve_url, graph,
+               blog_section="blog", page_size=10, site_url="", site_title="Blog", output=None, minify=False):
+    """
+    Generates the blog listing pages, sitemap.xml and feed.xml.
+
+    Archive pages are numbered from the oldest post (blog/page/1/ holds the
+    first page_size posts), so adding a post only changes the newest
+    archive page, the blog index, the sitemap and the feed. Each output
+    records a digest of the metadata it shows; outputs whose digest is
+    unchanged are neither rendered nor written.
+    output is the backend out_dir is written through (see output.py).
+    With minify, listing pages are minified like every other page.
+    Returns the dict of outputs (relative to out_dir) it owns.
+    """
+    blog_dir = os.path.join(content_dir, blog_section)
+    if not os.path.isdir(blog_dir):
+        return {}
+    output = output or DirectoryOutput(out_dir)
+    posts, reread = update_post_index(content_dir, blog_dir, out_dir, output, graph.digest)
+    print(f"Blog index: {len(posts)} post(s), {reread} re-read")
+    site_url = site_url.rstrip("/")
+    base = f"/{blog_section}/"
+    outputs = {}
+
+    def emit(rel, params, render, templated=True):
+        # the XML outputs depend on the metadata alone, not the template
+        inputs = [template_path, *template.includes] if templated and template_path else []
+        outputs[rel] = inputs[0] if inputs else None
+        if not graph.is_stale(rel, inputs, params):
+            graph.keep(rel)
+            return
+        print(f"Writing {rel}")
+        sha256 = output.write(rel, render())
+        graph.record(rel, inputs, params, sha256)
+
+    # listings embed the basepath and the hashed names of the template's assets
+    resolver_key = getattr(resolve_url, "cache_key", None) or resolve_url("/")
+    assets = getattr(resolve_url, "assets", None)
+    if assets is not None:
+        resolver_key = [resolver_key, assets.key_for(template.urls)]
+
+    def emit_page(rel, title, shown, older=None, newer=None):
+        params = {"listing": digest([title, shown, older, newer, resolver_key])}
+        render = lambda: template.render(title, listing_node(title, shown, resolve_url, older, newer).iter_html())
+        if minify:
+            params["minify"] = True
+            render = lambda render=render: minify_html_chunks(render())
+        emit(rel, params, render)
+
+    # stable archive pages, oldest first
+    chunks = [posts[i:i + page_size] for i in range(0, len(posts), page_size)]
+    for number, chunk in enumerate(chunks, 1):
+        older = f"{base}page/{number - 1}/" if number > 1 else None
+        newer = f"{base}page/{number + 1}/" if number < len(chunks) else None
+        emit_page(f"{blog_section}/page/{number}/index.html", f"{site_title}: page {number}",
+                  list(reversed(chunk)), older, newer)
+
+    # the blog front page shows the newest posts unless content provides one
+    newest = list(reversed(posts[-page_size:]))
+    if not os.path.exists(os.path.join(blog_dir, "index.md")):
+        older = f"{base}page/{len(chunks) - 1}/" if len(chunks) > 1 else None
+        emit_page(f"{blog_section}/index.html", site_title, newest, older)
+
+    lastmods = {post["url"]: post["date"] for post in posts}
+    urls = sorted(set(page_urls) | {f"{base}page/{n}/" for n in range(1, len(chunks) + 1)} | {base})
+    resolved = [resolve_url(url) for url in urls]
+    resolved_lastmods = {resolve_url(url): date for url, date in lastmods.items()}
+    emit("sitemap.xml", {"sitemap": digest([site_url, resolved, resolved_lastmods])},
+         lambda: [sitemap_xml(resolved, site_url, resolved_lastmods)], templated=False)
+
+    feed_posts = [dict(post, url=resolve_url(post["url"])) for post in reversed(posts[-FEED_SIZE:])]
+    feed_args = (feed_posts, site_url, site_title, resolve_url("/feed.xml"), resolve_url("/"))
+    emit("feed.xml", {"feed": digest(feed_args)}, lambda: [atom_feed(*feed_args)], templated=False)
+    return outputs
@@ -0,0 +1,73 @@
+import os
+import subprocess
+
+
+def git(root, *args):
+    """
+    Runs git in root and returns its stdout, or None if git fails. Paths
+    in the output are never quoted, so non-ASCII names come back as is.
+    """
+    try:
+        result = subprocess.run(["git", "-c", "core.quotePath=false", *args], cwd=root,
+                                capture_output=True, encoding="utf-8")
+    except OSError:
+        return None
+    if result.returncode != 0:
+        return None
+    return result.stdout
+
+
+def detect_changes(root, since_commit, paths):
+    """
+    Asks git which of the input paths changed since since_commit.
+
+    Returns (changed, commit). changed is the set of absolute paths of
+    files that differ between since_commit and HEAD, or None when git
+    can't answer reliably: no git, no previous commit, history missing
+    (shallow clone) or uncommitted changes under paths. Callers then
+    hash every input. commit is HEAD when the inputs are clean, so the
+    next build can diff from it, and None otherwise.
+    """
+    toplevel = git(root, "rev-parse", "--show-toplevel")
+    head = git(root, "rev-parse", "HEAD")
+    if toplevel is None or head is None:
+        return None, None
+    toplevel = toplevel.strip()
+    head = head.strip()
+    pathspecs = [os.path.relpath(path, root) for path in paths if os.path.exists(path)]
+    status = git(root, "status", "--porcelain", "--untracked-files=all", "--", *pathspecs)
+    if status is None or status.strip():
+        return None, None
+    if not since_commit:
+        return None, head
+    diff = git(root, "diff", "-z", "--name-only", "--no-renames", since_commit, head, "--", *pathspecs)
+    if diff is None:
+        return None, head
+    changed = {os.path.normpath(os.path.join(toplevel, name)) for name in diff.split("\0") if name}
+    return changed, head
+
+
+def added_dates(root, paths):
+    """
+    Returns the date (YYYY-MM-DD) of the commit that added each of paths,
+    from one git call, keyed by real path. Later edits don't change it.
+    Files git has no history for are left out; the result is empty when
+    git fails.
+    """
+    toplevel = git(root, "rev-parse", "--show-toplevel")
+    if toplevel is None:
+        return {}
+    toplevel = toplevel.strip()
+    log = git(root, "log", "--diff-filter=A", "--format=%x00%cI", "--name-only", "--no-renames", "--",
+              *[os.path.relpath(path, root) for path in paths])
+    if log is None:
+        return {}
+    dates = {}
+    date = None
+    for line in log.splitlines():
+        if line.startswith("\0"):
+            date = line[1:11]
+        elif line:
+            # newest first: a file deleted and added again dates from the re-add
+            dates.setdefault(os.path.normpath(os.path.join(toplevel, line)), date)
+    return dates
@@ -0,0 +1,211 @@
+import os
+import sys
+import json
+import errno
+import time
+import socket
+import argparse
+import threading
+import socketserver
+from collections import deque
+
+import main as site
+
+PROJECT_ROOT = site.PROJECT_ROOT
+DEFAULT_SOCKET = os.path.join(PROJECT_ROOT, '.ssg.sock')
+DEFAULT_TEMPLATE = os.path.join(PROJECT_ROOT, 'template.html')
+
+# Protocol: one JSON object per line in each direction. Requests carry an
+# "op" and its arguments, responses carry "ok" plus either the result or an
+# "error", and always the server-side latency in "ms".
+#   {"op": "render", "markdown": "...", "basepath": "/", "template": true}
+#   {"op": "build", "args": ["/repo/"]}
+#   {"op": "stats"}
+#   {"op": "shutdown"}
+
+
+class Metrics:
+    """Request counts and recent latencies per op."""
+
+    def __init__(self, window=1000):
+        self.lock = threading.Lock()
+        self.started = time.time()
+        self.window = window
+        self.latencies = {}
+        self.counts = {}
+        self.errors = 0
+
+    def record(self, op, ms, ok):
+        with self.lock:
+            self.counts[op] = self.counts.get(op, 0) + 1
+            self.latencies.setdefault(op, deque(maxlen=self.window)).append(ms)
+            if not ok:
+                self.errors += 1
+
+    def snapshot(self):
+        with self.lock:
+            ops = {}
+            for op, samples in self.latencies.items():
+                ordered = sorted(samples)
+                ops[op] = {
+                    "count": self.counts[op],
+                    "p50_ms": ordered[len(ordered) // 2],
+                    "p95_ms": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+                    "max_ms": ordered[-1],
+                }
+            return {"uptime_s": round(time.time() - self.started, 3), "errors": self.errors, "ops": ops}
+
+
+class RenderHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            start = time.perf_counter()
+            op = None
+            try:
+                request = json.loads(line)
+                op = request.get("op")
+                response = self.server.dispatch(op, request)
+                response["ok"] = True
+            except Exception as e:
+                response = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+            ms = round((time.perf_counter() - start) * 1000, 3)
+            response["ms"] = ms
+            self.server.metrics.record(op or "invalid", ms, response["ok"])
+            self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+            self.wfile.flush()
+            if op == "shutdown" and response["ok"]:
+                threading.Thread(target=self.server.shutdown, daemon=True).start()
+                return
+
+
+class RenderDaemon(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """
+    Keeps the generator's modules, templates and caches warm in one process
+    and serves render/build requests over a local Unix socket.
+    """
+    daemon_threads = True
+
+    def __init__(self, socket_path=DEFAULT_SOCKET, template_path=DEFAULT_TEMPLATE):
+        if os.path.exists(socket_path):
+            if is_listening(socket_path):
+                raise OSError(errno.EADDRINUSE, "a render daemon is already listening", socket_path)
+            # left behind by a daemon that didn't shut down cleanly
+            os.remove(socket_path)
+        self.socket_path = socket_path
+        self.template_path = template_path
+        self.metrics = Metrics()
+        # serialize full builds; renders are independent and run concurrently
+        self.build_lock = threading.Lock()
+        super().__init__(socket_path, RenderHandler)
+
+    def dispatch(self, op, request):
+        if op == "render":
+            md = request["markdown"]
+            basepath = request.get("basepath", "/")
+            template = request.get("template", False)
+            if template:
+                path = self.template_path if template is True else template
+                return {"html": site.render_page(md, site.load_template(path, basepath), basepath)}
+            # render_page drops front matter itself; fragments do it here
+            _, body = site.split_front_matter(md)
+            node = site.markdown_to_html_node(body, site.get_resolver(basepath), site.block_cache)
+            try:
+                title = site.extract_title(body)
+            except ValueError:
+                # fragments (previews of a section) need no h1
+                title = None
+            return {"html": node.to_html(), "title": title}
+        if op == "build":
+            with self.build_lock:
+                try:
+                    status = site.main(request.get("args", []))
+                except SystemExit:
+                    # argparse rejected the arguments; keep the daemon alive
+                    raise ValueError(f"invalid build arguments: {request.get('args')}")
+                if status:
+                    raise ValueError("build failed: broken internal links")
+            return {}
+        if op == "stats":
+            stats = self.metrics.snapshot()
+            cache = site.block_cache
+            stats["block_cache"] = {"entries": len(cache.entries), "hits": cache.hits, "misses": cache.misses}
+            return stats
+        if op == "shutdown":
+            return {}
+        raise ValueError(f"unknown op: {op}")
+
+    def server_close(self):
+        super().server_close()
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+
+
+def is_listening(socket_path):
+    """Whether something accepts connections on the Unix socket."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(socket_path)
+        except OSError:
+            return False
+    return True
+
+
+def request(payload, socket_path=DEFAULT_SOCKET):
+    """Sends one request to a running daemon and returns the decoded response."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(socket_path)
+        sock.sendall(json.dumps(payload).encode("utf-8") + b"\n")
+        with sock.makefile("rb") as f:
+            return json.loads(f.readline())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render daemon and client.")
+    parser.add_argument('--socket', default=DEFAULT_SOCKET, help="Unix socket path")
+    sub = parser.add_subparsers(dest='command', required=True)
+    serve = sub.add_parser('serve', help="run the daemon in the foreground")
+    serve.add_argument('--template', default=DEFAULT_TEMPLATE)
+    render = sub.add_parser('render', help="render a markdown file to stdout")
+    render.add_argument('path')
+    render.add_argument('--basepath', default='/')
+    render.add_argument('--fragment', action='store_true', help="skip the page template")
+    build = sub.add_parser('build', help="run a full site build in the daemon")
+    build.add_argument('args', nargs='*', help="arguments for main.py, e.g. /repo/ --output DIR")
+    sub.add_parser('stats', help="print latency metrics")
+    sub.add_parser('stop', help="shut the daemon down")
+    args, extra = parser.parse_known_args(argv)
+    if extra and args.command != 'build':
+        parser.error(f"unrecognized arguments: {' '.join(extra)}")
+
+    if args.command == 'serve':
+        with RenderDaemon(args.socket, args.template) as server:
+            print(f"Render daemon listening on {args.socket}")
+            server.serve_forever()
+        return 0
+
+    if args.command == 'render':
+        with open(args.path, 'r', encoding='utf-8') as f:
+            payload = {"op": "render", "markdown": f.read(), "basepath": args.basepath,
+                       "template": not args.fragment}
+    elif args.command == 'build':
+        payload = {"op": "build", "args": args.args + extra}
+    elif args.command == 'stats':
+        payload = {"op": "stats"}
+    else:
+        payload = {"op": "shutdown"}
+    response = request(payload, args.socket)
+    if not response["ok"]:
+        print(response["error"], file=sys.stderr)
+        return 1
+    if args.command == 'render':
+        sys.stdout.write(response["html"])
+    elif args.command == 'stats':
+        print(json.dumps(response, indent=2))
+    print(f"({response['ms']} ms)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
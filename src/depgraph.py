@@ -0,0 +1,175 @@
+import os
+import json
+import hashlib
+from output import DirectoryOutput
+
+MANIFEST_NAME = ".manifest.json"
+
+
+def file_digest(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def read_manifest(out_dir):
+    path = os.path.join(out_dir, MANIFEST_NAME)
+    if not os.path.exists(path):
+        raise ValueError(f"no build manifest in {out_dir}")
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def manifest_data(entries, shard=None, commit=None):
+    return {"shard": shard, "commit": commit, "outputs": dict(sorted(entries.items()))}
+
+
+def write_manifest(out_dir, entries, shard=None, commit=None):
+    """
+    Writes out_dir/.manifest.json. entries maps each output path (relative
+    to out_dir) to {"source", "sha256", "inputs", "params"}. commit is the
+    git commit the inputs were clean at, if any.
+    """
+    manifest = manifest_data(entries, shard, commit)
+    with open(os.path.join(out_dir, MANIFEST_NAME), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    return manifest
+
+
+class DependencyGraph:
+    """
+    Links every output file to the inputs it was built from.
+
+    Inputs are files (markdown source, template, static source) recorded
+    with their sha256, plus build parameters such as the basepath. An output
+    is stale when it is missing, new, or any of its inputs or parameters
+    changed since it was recorded. Input paths are stored relative to root
+    so the graph survives moving the checkout. Outputs are looked up and
+    removed through an output backend (see output.py), by default the
+    out_dir directory.
+    """
+
+    def __init__(self, root, out_dir, entries=None, commit=None, output=None):
+        self.root = root
+        self.out_dir = out_dir
+        self.output = output or DirectoryOutput(out_dir)
+        self.previous = entries or {}
+        self.commit = commit
+        self.entries = {}
+        self._digests = {}
+        self._changed = None
+
+    @classmethod
+    def load(cls, root, out_dir, output=None):
+        """
+        Loads the graph from the previous build's manifest, if any, read
+        through output (default: the out_dir directory).
+        """
+        output = output or DirectoryOutput(out_dir)
+        try:
+            manifest = json.loads(output.read(MANIFEST_NAME) or "{}")
+            entries = manifest["outputs"]
+        except (KeyError, json.JSONDecodeError):
+            return cls(root, out_dir, output=output)
+        return cls(root, out_dir, entries, manifest.get("commit"), output)
+
+    def trust_unchanged(self, changed, scope=None):
+        """
+        Takes the set of input paths known to have changed since the last
+        build (e.g. from git). Every other input that the previous build
+        recorded keeps its recorded digest without being read. scope, if
+        given, lists the files and directories changed covers; inputs
+        outside it are still hashed. Paths are compared with symlinks
+        resolved, since git reports real paths.
+        """
+        self._changed = {os.path.realpath(path) for path in changed}
+        scope = None if scope is None else [os.path.realpath(path) for path in scope]
+        real_root = os.path.realpath(self.root)
+        for entry in self.previous.values():
+            for key, digest in entry.get("inputs", {}).items():
+                real = os.path.normpath(os.path.join(real_root, key))
+                if real in self._changed:
+                    continue
+                if scope is not None and not any(real == s or real.startswith(s + os.sep) for s in scope):
+                    continue
+                self._digests.setdefault(os.path.normpath(os.path.join(self.root, key)), digest)
+
+    def key(self, path):
+        return os.path.relpath(path, self.root).replace(os.sep, "/")
+
+    def digest(self, path):
+        # each input is hashed at most once per build (the template is
+        # shared by every page)
+        path = os.path.normpath(path)
+        digest = self._digests.get(path)
+        if digest is None:
+            digest = file_digest(path)
+            self._digests[path] = digest
+        return digest
+
+    def fingerprint(self, inputs):
+        return {self.key(path): self.digest(path) for path in inputs}
+
+    def is_stale(self, output, inputs, params=None):
+        """
+        output is relative to out_dir, inputs is a list of input file paths
+        with the primary source first (possibly empty for outputs derived
+        only from params, like a sitemap).
+        """
+        entry = self.previous.get(output)
+        if entry is None or not self.output.exists(output):
+            return True
+        if entry.get("params", {}) != (params or {}):
+            return True
+        return entry.get("inputs") != self.fingerprint(inputs)
+
+    def keep(self, output):
+        """Carries an up-to-date output over from the previous build."""
+        self.entries[output] = self.previous[output]
+
+    def keep_unrecorded(self):
+        """
+        Carries over every output of the previous build that this one did
+        not record, for builds that only regenerate some outputs (e.g. the
+        blog stage after merging shards).
+        """
+        for output in self.previous:
+            self.entries.setdefault(output, self.previous[output])
+
+    def record(self, output, inputs, params=None, sha256=None, links=None):
+        """
+        Records a freshly built output. links, if given, are the [url, line]
+        pairs found while parsing it, kept so unchanged pages can be link
+        checked without being parsed again.
+        """
+        if sha256 is None:
+            sha256 = file_digest(os.path.join(self.out_dir, output))
+        self.entries[output] = {
+            "source": self.key(inputs[0]) if inputs else None,
+            "sha256": sha256,
+            "inputs": self.fingerprint(inputs),
+            "params": params or {},
+        }
+        if links:
+            self.entries[output]["links"] = links
+
+    def remove_orphans(self):
+        """
+        Deletes outputs of the previous build that this build no longer
+        produces (their sources are gone), pruning directories left empty.
+        Files the graph never produced are left alone. Returns the removed
+        outputs.
+        """
+        removed = sorted(set(self.previous) - set(self.entries))
+        for output in removed:
+            if self.output.exists(output):
+                print(f"Removing stale output {os.path.join(self.out_dir, output)}")
+            self.output.remove(output)
+        return removed
+
+    def save(self, shard=None, commit=None):
+        manifest = manifest_data(self.entries, shard, commit)
+        self.output.write(MANIFEST_NAME, [json.dumps(manifest, indent=1, sort_keys=True)])
+        return manifest
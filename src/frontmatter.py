@@ -0,0 +1,40 @@
+def split_front_matter(markdown):
+    """
+    Splits an optional front matter block off the top of a markdown
+    document and returns (metadata dict, body). Front matter is a run of
+    "key: value" lines between two "---" lines:
+
+        ---
+        date: 2024-05-01
+        summary: A short description
+        ---
+        # Title
+    """
+    if not markdown.startswith("---\n"):
+        return {}, markdown
+    end = markdown.find("\n---", 3)
+    if end == -1:
+        return {}, markdown
+    meta = {}
+    for line in markdown[4:end].split("\n"):
+        key, sep, value = line.partition(":")
+        if sep and key.strip():
+            meta[key.strip().lower()] = value.strip()
+    body = markdown[end + 4:]
+    return meta, body.lstrip("\n")
+
+
+def read_front_matter(path):
+    """
+    Reads only the front matter of a markdown file (nothing past the
+    closing "---") and returns its metadata dict.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        if f.readline() != "---\n":
+            return {}
+        lines = ["---\n"]
+        for line in f:
+            lines.append(line)
+            if line.rstrip("\n") == "---":
+                return split_front_matter("".join(lines) + "\n")[0]
+    return {}
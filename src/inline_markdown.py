@@ -1,8 +1,23 @@
 from textnode import TextNode, TextType
 from enum import Enum
+from collections import OrderedDict
 import re
+import hashlib
+import threading
 from htmlnode import ParentNode, LeafNode
 from textnode import text_node_to_html_node
+from rules import RuleRegistry, BlockRule, InlineRule
+
+# compiled once at import so repeated renders (render_many, the daemon)
+# don't go through the re module's pattern cache on every call
+_HEADING_RE = re.compile(r"^(#{1,6}) (.*)$")
+_ORDERED_ITEM_RE = re.compile(r"^\d+\. (.*)$")
+_TITLE_RE = re.compile(r"^# (.*)")
+_IMAGE_RE = re.compile(r'!\[([^\]]*)\]\(([^\)]+)\)')
+_LINK_RE = re.compile(r'(?<!!)\[([^\]]+)\]\(([^\)]+)\)')
+_TABLE_SEPARATOR_RE = re.compile(r"^\|?\s*:?-+:?\s*(\|\s*:?-+:?\s*)*\|?$")
+_TABLE_CELL_SPLIT_RE = re.compile(r"(?<!\\)\|")
+_FOOTNOTE_DEF_RE = re.compile(r"^\[\^([^\]\s]+)\]: ?(.*)", re.S)
 
 class BlockType(Enum):
     PARAGRAPH = "paragraph"
@@ -11,35 +26,120 @@ class BlockType(Enum):
     QUOTE = "quote"
     UNORDERED_LIST = "unordered_list"
     ORDERED_LIST = "ordered_list"
+    TABLE = "table"
+    FOOTNOTE = "footnote"
+
+
+# Block rules: match(block, lines) and render(block, children)
+
+def _is_heading(block, lines):
+    return len(lines) == 1 and _HEADING_RE.match(lines[0]) is not None
+
+def _heading_node(block, children):
+    match = _HEADING_RE.match(block)
+    return ParentNode(f"h{len(match.group(1))}", children(match.group(2)))
+
+def _is_code(block, lines):
+    # starts and ends with 3 backticks
+    return len(lines) >= 2 and lines[0].startswith("```") and lines[-1].startswith("```")
+
+def _code_node(block, children):
+    code_lines = block.split("\n")[1:-1]
+    code_text = "\n".join(code_lines) + ("\n" if code_lines else "")
+    return ParentNode("pre", [LeafNode("code", code_text)])
+
+def _is_quote(block, lines):
+    return all(line.startswith(">") for line in lines)
+
+def _quote_node(block, children):
+    text = " ".join(line.lstrip("> ").strip() for line in block.split("\n"))
+    return ParentNode("blockquote", children(text))
+
+def _is_unordered_list(block, lines):
+    return all(line.startswith("- ") for line in lines)
+
+def _unordered_list_node(block, children):
+    return ParentNode("ul", [ParentNode("li", children(line[2:].strip())) for line in block.split("\n")])
+
+def _is_ordered_list(block, lines):
+    # every line starts with an incrementing number, dot, space
+    return all(line.startswith(f"{idx + 1}. ") for idx, line in enumerate(lines))
+
+def _ordered_list_node(block, children):
+    return ParentNode("ol", [ParentNode("li", children(_ORDERED_ITEM_RE.match(line).group(1)))
+                             for line in block.split("\n")])
+
+def _table_cells(line):
+    line = line.strip()
+    if line.startswith("|"):
+        line = line[1:]
+    if line.endswith("|") and not line.endswith("\\|"):
+        line = line[:-1]
+    return [cell.strip().replace("\\|", "|") for cell in _TABLE_CELL_SPLIT_RE.split(line)]
+
+def _is_table(block, lines):
+    # a header row, a |---|:--:| separator row, then body rows
+    return (len(lines) >= 2 and all(line.startswith("|") for line in lines)
+            and _TABLE_SEPARATOR_RE.match(lines[1]) is not None)
+
+def _table_node(block, children):
+    lines = block.split("\n")
+    aligns = []
+    for cell in _table_cells(lines[1]):
+        left, right = cell.startswith(":"), cell.endswith(":")
+        aligns.append("center" if left and right else "right" if right else "left" if left else None)
+
+    def row(line, tag):
+        cells = (_table_cells(line) + [""] * len(aligns))[:len(aligns)]
+        return ParentNode("tr", [ParentNode(tag, children(cell), {"style": f"text-align: {align}"} if align else None)
+                                 for cell, align in zip(cells, aligns)])
+
+    sections = [ParentNode("thead", [row(lines[0], "th")])]
+    if len(lines) > 2:
+        sections.append(ParentNode("tbody", [row(line, "td") for line in lines[2:]]))
+    return ParentNode("table", sections)
+
+def _is_footnote(block, lines):
+    return _FOOTNOTE_DEF_RE.match(lines[0]) is not None
+
+def _footnote_node(block, children):
+    match = _FOOTNOTE_DEF_RE.match(block)
+    label = match.group(1)
+    text = " ".join(line.strip() for line in match.group(2).split("\n"))
+    return ParentNode("div", [LeafNode("sup", label), LeafNode(None, " "), *children(text),
+                              LeafNode(None, " "), LeafNode("a", "↩", {"href": f"#fnref-{label}"})],
+                      {"class": "footnote", "id": f"fn-{label}"})
+
+def _paragraph_node(block, children):
+    return ParentNode("p", children(block.replace("\n", " ")))
+
+
+# The syntax the renderer knows, in priority order. Adding syntax is one
+# add_block/add_inline call; the registry compiles the inline rules into a
+# single regex and dispatches blocks on their first character.
+rules = RuleRegistry(BlockRule("paragraph", BlockType.PARAGRAPH, None, _paragraph_node))
+rules.add_block(BlockRule("heading", BlockType.HEADING, _is_heading, _heading_node, "#"))
+rules.add_block(BlockRule("code", BlockType.CODE, _is_code, _code_node, "`"))
+rules.add_block(BlockRule("quote", BlockType.QUOTE, _is_quote, _quote_node, ">"))
+rules.add_block(BlockRule("unordered_list", BlockType.UNORDERED_LIST, _is_unordered_list, _unordered_list_node, "-"))
+rules.add_block(BlockRule("ordered_list", BlockType.ORDERED_LIST, _is_ordered_list, _ordered_list_node, "1"))
+rules.add_block(BlockRule("table", BlockType.TABLE, _is_table, _table_node, "|"))
+rules.add_block(BlockRule("footnote", BlockType.FOOTNOTE, _is_footnote, _footnote_node, "["))
+
+rules.add_inline(InlineRule("image", _IMAGE_RE.pattern, lambda alt, url: TextNode(alt, TextType.IMAGE, url), "!"))
+rules.add_inline(InlineRule("footnote", r"\[\^([^\]\s]+)\](?!\()", lambda label: TextNode(label, TextType.FOOTNOTE), "["))
+rules.add_inline(InlineRule("link", _LINK_RE.pattern, lambda text, url: TextNode(text, TextType.LINK, url), "["))
+rules.add_inline(InlineRule("bold", r"\*\*(.*?)\*\*", lambda text: TextNode(text, TextType.BOLD), "*", "**"))
+rules.add_inline(InlineRule("italic", r"_(.*?)_", lambda text: TextNode(text, TextType.ITALIC), "_", "_"))
+rules.add_inline(InlineRule("code", r"`(.*?)`", lambda text: TextNode(text, TextType.CODE), "`", "`"))
+rules.add_inline(InlineRule("strikethrough", r"~~(.*?)~~", lambda text: TextNode(text, TextType.STRIKETHROUGH), "~", "~~"))
 
 def block_to_block_type(block: str) -> BlockType:
     """
     Determines the type of markdown block.
     Assumes block is stripped of leading/trailing whitespace.
     """
-    lines = block.split("\n")
-    # Heading: starts with 1-6 #, then space
-    if len(lines) == 1 and re.match(r"^#{1,6} ", lines[0]):
-        return BlockType.HEADING
-    # Code block: starts and ends with 3 backticks
-    if lines[0].startswith("```") and lines[-1].startswith("```") and len(lines) >= 2:
-        return BlockType.CODE
-    # Quote: every line starts with '>'
-    if all(line.startswith(">") for line in lines):
-        return BlockType.QUOTE
-    # Unordered list: every line starts with '- '
-    if all(line.startswith("- ") for line in lines):
-        return BlockType.UNORDERED_LIST
-    # Ordered list: every line starts with incrementing number, dot, space
-    is_ordered = True
-    for idx, line in enumerate(lines):
-        if not re.match(rf"^{idx+1}\. ", line):
-            is_ordered = False
-            break
-    if is_ordered and len(lines) > 0:
-        return BlockType.ORDERED_LIST
-    # Default: paragraph
-    return BlockType.PARAGRAPH
+    return rules.block_rule(block).btype
 
 
 def split_nodes_delimiter(old_nodes, delimiter, text_type):
@@ -66,23 +166,19 @@ def split_nodes_delimiter(old_nodes, delimiter, text_type):
 def text_to_textnodes(text):
     """
     Converts a markdown-flavored text string into a list of TextNode objects.
-    Handles images, links, bold (**), italic (_), and code (`) formatting.
-    """
-    nodes = [TextNode(text, TextType.TEXT)]
-    # Order: image, link, bold, italic, code
-    nodes = split_nodes_image(nodes)
-    nodes = split_nodes_link(nodes)
-    nodes = split_nodes_delimiter(nodes, "**", TextType.BOLD)
-    nodes = split_nodes_delimiter(nodes, "_", TextType.ITALIC)
-    nodes = split_nodes_delimiter(nodes, "`", TextType.CODE)
+    Handles every registered inline rule: images, links, bold (**), italic
+    (_), code (`), strikethrough (~~) and footnote references ([^1]).
+    """
+    nodes = rules.tokenize(text)
     return [node for node in nodes if node.text or node.text_type in (TextType.IMAGE, TextType.LINK)]
+
+
 def extract_markdown_images(text):
     """
     Extracts markdown images from text.
     Returns a list of (alt, url) tuples.
     """
-    pattern = r'!\[([^\]]*)\]\(([^\)]+)\)'
-    return re.findall(pattern, text)
+    return _IMAGE_RE.findall(text)
 
 
 def extract_markdown_links(text):
@@ -91,8 +187,7 @@ def extract_markdown_links(text):
     Returns a list of (anchor, url) tuples.
     Skips images (does not match links that start with ![).
     """
-    pattern = r'(?<!!)\[([^\]]+)\]\(([^\)]+)\)'
-    return re.findall(pattern, text)
+    return _LINK_RE.findall(text)
 
 
 def split_nodes_image(old_nodes):
@@ -101,14 +196,13 @@ def split_nodes_image(old_nodes):
     For example, 'text ![alt](url) text' -> [TEXT, IMAGE, TEXT]
     """
     new_nodes = []
-    image_pattern = r'!\[([^\]]*)\]\(([^\)]+)\)'
     for node in old_nodes:
         if node.text_type != TextType.TEXT:
             new_nodes.append(node)
             continue
         text = node.text
         last_idx = 0
-        for match in re.finditer(image_pattern, text):
+        for match in _IMAGE_RE.finditer(text):
             start, end = match.span()
             alt, url = match.groups()
             if start > last_idx:
@@ -129,14 +223,13 @@ def split_nodes_link(old_nodes):
     For example, 'text [anchor](url) text' -> [TEXT, LINK, TEXT]
     """
     new_nodes = []
-    link_pattern = r'(?<!!)\[([^\]]+)\]\(([^\)]+)\)'
     for node in old_nodes:
         if node.text_type != TextType.TEXT:
             new_nodes.append(node)
             continue
         text = node.text
         last_idx = 0
-        for match in re.finditer(link_pattern, text):
+        for match in _LINK_RE.finditer(text):
             start, end = match.span()
             anchor, url = match.groups()
             if start > last_idx:
@@ -162,62 +255,121 @@ def markdown_to_blocks(markdown):
     result = [block.strip() for block in blocks if block.strip() != ""]
     return result
 
-# helper to convert inline text to HTMLNode children
-def text_to_children(text):
+def markdown_to_blocks_with_lines(markdown):
+    """
+    Like markdown_to_blocks, but returns (block, line) pairs where line is
+    the 1-based line number the block starts on.
+    """
+    result = []
+    line = 1
+    for part in markdown.split("\n\n"):
+        block = part.strip()
+        if block != "":
+            leading = part[: len(part) - len(part.lstrip())]
+            result.append((block, line + leading.count("\n")))
+        line += part.count("\n") + 2
+    return result
+
+# helper to convert inline text to HTMLNode children; on_link, if given,
+# is called with the URL of every link and image
+def text_to_children(text, resolve_url=None, on_link=None):
     nodes = text_to_textnodes(text)
-    return [text_node_to_html_node(node) for node in nodes]
+    if on_link is not None:
+        for node in nodes:
+            if node.text_type == TextType.LINK or node.text_type == TextType.IMAGE:
+                on_link(node.url)
+    return [text_node_to_html_node(node, resolve_url) for node in nodes]
+
+def block_to_html_node(block, btype, resolve_url=None, on_link=None):
+    """
+    Converts a single markdown block of the given BlockType into an HTMLNode.
+    """
+    children = lambda text: text_to_children(text, resolve_url, on_link)
+    return rules.rule_for_type(btype).render(block, children)
+
+
+class BlockCache:
+    """
+    Serialized HTML of rendered blocks, keyed on the block's type and a
+    hash of its text (plus the URL resolver's basepath, which is baked into
+    the HTML, and the version of the rule registry). Re-rendering a large
+    document after a one-paragraph edit then only converts the changed
+    blocks. Each entry keeps what its link and image URLs resolved to; an
+    entry whose URLs now resolve differently (a fingerprinted asset was
+    renamed) is rendered again. Least recently used entries are evicted
+    beyond max_entries.
+    """
+
+    def __init__(self, max_entries=10000):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def render(self, block, btype, resolve_url=None, on_link=None):
+        """
+        Returns the block's HTML, rendering it only on a cache miss. The
+        block's link and image URLs are cached too and replayed to on_link.
+        """
+        digest = hashlib.sha1(block.encode("utf-8")).digest()
+        key = (btype, digest, getattr(resolve_url, "cache_key", None), rules.version)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry[2] != _resolve_all(entry[1], resolve_url):
+                entry = None
+            if entry is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+        if entry is None:
+            urls = []
+            html = block_to_html_node(block, btype, resolve_url, urls.append).to_html()
+            entry = (html, tuple(urls), _resolve_all(urls, resolve_url))
+            with self.lock:
+                self.entries[key] = entry
+                if len(self.entries) > self.max_entries:
+                    self.entries.popitem(last=False)
+        if on_link is not None:
+            for url in entry[1]:
+                on_link(url)
+        return entry[0]
+
+
+def _resolve_all(urls, resolve_url):
+    return tuple(urls) if resolve_url is None else tuple(resolve_url(url) for url in urls)
+
+
+def _link_reporter(on_link, block, start_line):
+    # maps a URL found in block back to the source line it appears on
+    def report(url):
+        line = start_line
+        for offset, text in enumerate(block.split("\n")):
+            if f"]({url})" in text:
+                line = start_line + offset
+                break
+        on_link(url, line)
+    return report
 
-def markdown_to_html_node(markdown):
+def markdown_to_html_node(markdown, resolve_url=None, cache=None, on_link=None):
     """
     Converts a full markdown document into a single parent HTMLNode.
+    resolve_url, if given, maps link and image URLs as nodes are built.
+    With a BlockCache, unchanged blocks become leaves holding their cached
+    HTML. Resolvers without a cache_key bypass the cache.
+    on_link, if given, is called with (url, line) for every link and image.
     """
-    blocks = markdown_to_blocks(markdown)
+    if resolve_url is not None and getattr(resolve_url, "cache_key", None) is None:
+        cache = None
     children = []
-    for block in blocks:
+    for block, line in markdown_to_blocks_with_lines(markdown):
         btype = block_to_block_type(block)
-        if btype == BlockType.PARAGRAPH:
-            content = block.replace("\n", " ")
-            inline_children = text_to_children(content)
-            children.append(ParentNode("p", inline_children))
-        elif btype == BlockType.HEADING:
-            match = re.match(r"^(#{1,6}) (.*)$", block)
-            level = len(match.group(1))
-            content = match.group(2)
-            inline_children = text_to_children(content)
-            children.append(ParentNode(f"h{level}", inline_children))
-        elif btype == BlockType.CODE:
-            lines = block.split("\n")
-            code_lines = lines[1:-1]
-            code_text = "\n".join(code_lines) + ("\n" if code_lines else "")
-            code_node = LeafNode("code", code_text)
-            children.append(ParentNode("pre", [code_node]))
-        elif btype == BlockType.UNORDERED_LIST:
-            lines = block.split("\n")
-            items = []
-            for line in lines:
-                content = line[2:].strip()
-                inline_children = text_to_children(content)
-                items.append(ParentNode("li", inline_children))
-            children.append(ParentNode("ul", items))
-        elif btype == BlockType.ORDERED_LIST:
-            lines = block.split("\n")
-            items = []
-            for line in lines:
-                m = re.match(r"^\d+\. (.*)$", line)
-                content = m.group(1)
-                inline_children = text_to_children(content)
-                items.append(ParentNode("li", inline_children))
-            children.append(ParentNode("ol", items))
-        elif btype == BlockType.QUOTE:
-            lines = block.split("\n")
-            text = " ".join(line.lstrip("> ").strip() for line in lines)
-            inline_children = text_to_children(text)
-            children.append(ParentNode("blockquote", inline_children))
+        report = None if on_link is None else _link_reporter(on_link, block, line)
+        if cache is None:
+            children.append(block_to_html_node(block, btype, resolve_url, report))
         else:
-            # fallback to paragraph
-            content = block.replace("\n", " ")
-            inline_children = text_to_children(content)
-            children.append(ParentNode("p", inline_children))
+            children.append(LeafNode(None, cache.render(block, btype, resolve_url, report)))
     return ParentNode("div", children)
 
 # Extract the first-level heading from markdown text
@@ -227,7 +379,7 @@ def extract_title(markdown: str) -> str:
     """
     lines = markdown.splitlines()
     for line in lines:
-        match = re.match(r"^# (.*)", line.lstrip())
+        match = _TITLE_RE.match(line.lstrip())
         if match:
             return match.group(1).strip()
     raise ValueError("No h1 header found")
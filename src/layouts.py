@@ -0,0 +1,50 @@
+import os
+
+# a content directory's own template, used by every page below it
+LAYOUT_NAME = "_layout.html"
+
+
+class LayoutResolver:
+    """
+    Picks the template for each page: the layout named by its front matter
+    ("layout: post" is layouts_dir/post.html), else the nearest _layout.html
+    in its directory or a parent directory up to content_dir, else the
+    default template. The answer for each directory is memoized, so the
+    filesystem is probed once per directory, not once per page.
+    """
+
+    def __init__(self, content_dir, default_template, layouts_dir=None):
+        self.content_dir = os.path.normpath(content_dir)
+        self.default_template = default_template
+        self.layouts_dir = layouts_dir
+        self._by_dir = {}
+        self._by_name = {}
+
+    def for_directory(self, directory):
+        directory = os.path.normpath(directory)
+        layout = self._by_dir.get(directory)
+        if layout is None:
+            candidate = os.path.join(directory, LAYOUT_NAME)
+            if os.path.isfile(candidate):
+                layout = candidate
+            elif directory == self.content_dir or not directory.startswith(self.content_dir + os.sep):
+                layout = self.default_template
+            else:
+                layout = self.for_directory(os.path.dirname(directory))
+            self._by_dir[directory] = layout
+        return layout
+
+    def resolve(self, src_path, meta=None):
+        """Template path for the page at src_path with front matter meta."""
+        name = (meta or {}).get("layout")
+        if not name:
+            return self.for_directory(os.path.dirname(src_path))
+        path = self._by_name.get(name)
+        if path is None:
+            if self.layouts_dir is None:
+                raise ValueError(f"{src_path}: layout {name!r} requested but no layouts directory is configured")
+            path = os.path.join(self.layouts_dir, name if name.endswith(".html") else name + ".html")
+            if not os.path.isfile(path):
+                raise ValueError(f"{src_path}: unknown layout {name!r} (no {path})")
+            self._by_name[name] = path
+        return path
@@ -0,0 +1,60 @@
+import os
+import threading
+
+
+def output_urls(rel_path):
+    """
+    The root-relative URLs under which an output file (relative to the
+    output directory) is reachable: blog/tom/index.html answers to
+    /blog/tom/index.html, /blog/tom/ and /blog/tom; notes.html to
+    /notes.html and /notes.
+    """
+    url = "/" + rel_path.replace(os.sep, "/")
+    urls = [url]
+    if url.endswith("/index.html"):
+        directory = url[: -len("index.html")]
+        urls.append(directory)
+        if directory != "/":
+            urls.append(directory[:-1])
+    elif url.endswith(".html"):
+        urls.append(url[: -len(".html")])
+    return urls
+
+
+class BrokenLinks(ValueError):
+    """Raised by builds with check_links set to "error"."""
+
+
+class LinkChecker:
+    """
+    Validates root-relative link and image URLs against a hash-set of every
+    URL the build will produce (pages and static files, known before any
+    page renders). Links are checked as pages are parsed, so no output HTML
+    is ever read back. check() is thread-safe.
+    """
+
+    def __init__(self, outputs=()):
+        self.urls = set()
+        self.broken = []
+        self.lock = threading.Lock()
+        for rel_path in outputs:
+            self.add(rel_path)
+
+    def add(self, rel_path):
+        self.urls.update(output_urls(rel_path))
+
+    def is_valid(self, url):
+        if not url.startswith("/") or url.startswith("//"):
+            # external, protocol-relative and relative URLs are not checked
+            return True
+        path = url.split("#", 1)[0].split("?", 1)[0]
+        return path in self.urls
+
+    def check(self, source, line, url):
+        if not self.is_valid(url):
+            with self.lock:
+                self.broken.append((source, line, url))
+
+    def report(self):
+        """Returns one "source:line: broken link url" message per problem."""
+        return [f"{source}:{line}: broken link {url}" for source, line, url in sorted(self.broken)]
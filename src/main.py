@@ -1,25 +1,39 @@
 import os
 import sys
 import shutil
-from pathlib import Path
-from textnode import *
-from inline_markdown import markdown_to_html_node, extract_title
+import argparse
+from inline_markdown import BlockCache, markdown_to_html_node, extract_title
+from frontmatter import split_front_matter, read_front_matter
+from layouts import LayoutResolver
+from assets import MANIFEST_NAME as ASSET_MANIFEST, fingerprint_static
+from blog import build_blog, listing_pages, page_url
+from linkcheck import LinkChecker, BrokenLinks
+from changes import detect_changes
+from search_index import page_sources, update_search_index_from_files
+from shards import parse_shard, select_shard, merge_shards
+from depgraph import DependencyGraph, file_digest
+from template import Template, load_template, write_chunks
+from output import DirectoryOutput, ArchiveOutput
+from urls import get_resolver
+from minify import minify_html, minify_html_chunks, minify_css_cached
 
-def copy_static(src, dst):
+def clean_output(dst):
     # clean destination
     if os.path.exists(dst):
         shutil.rmtree(dst)
-    # ensure base and images dirs
     os.makedirs(dst)
-    os.makedirs(os.path.join(dst, 'images'), exist_ok=True)
+
+def discover_static(src, dst):
+    """
+    Lists the (static source, destination) file pairs for the static tree.
+    """
+    files_out = []
     # walk source
     for root, dirs, files in os.walk(src):
+        dirs.sort()
         rel = os.path.relpath(root, src)
         base_dest = dst if rel == '.' else os.path.join(dst, rel)
-        # replicate subdirs
-        for d in dirs:
-            os.makedirs(os.path.join(base_dest, d), exist_ok=True)
-        for f in files:
+        for f in sorted(files):
             src_file = os.path.join(root, f)
             # map style.css to index.css at root, and root pngs under images/
             if rel == '.' and f.lower() == 'style.css':
@@ -31,92 +45,478 @@ def copy_static(src, dst):
             else:
                 dst_sub = base_dest
                 dst_name = f
-            os.makedirs(dst_sub, exist_ok=True)
-            dst_file = os.path.join(dst_sub, dst_name)
+            files_out.append((src_file, os.path.join(dst_sub, dst_name)))
+    return files_out
+
+def static_params(rel, minify=False):
+    # how a static file is processed on its way to the output
+    ext = os.path.splitext(rel)[1].lower()
+    return {'minify': True} if minify and ext in ('.css', '.html') else {}
+
+def fingerprint_assets(src, dst, graph=None, minify=False):
+    """
+    Hashes the static tree (in parallel) and returns the assets.AssetMap
+    from output names to content-hashed names.
+    """
+    files = [(src_file, os.path.relpath(dst_file, dst)) for src_file, dst_file in discover_static(src, dst)]
+    digest = graph.digest if graph is not None else file_digest
+    return fingerprint_static(files, digest, lambda rel: static_params(rel, minify))
+
+def copy_static(src, dst, graph=None, minify=False, output=None, assets=None):
+    """
+    Copies the static tree into dst. With a dependency graph, files whose
+    source is unchanged since the last build are left in place. With
+    minify, CSS and HTML files are minified on the way. output is the
+    backend dst is written through (default: the dst directory). With an
+    assets.AssetMap, files are written under their fingerprinted names.
+    Returns a dict mapping each static output (relative to dst) to its source.
+    """
+    copied = {}
+    if output is None:
+        output = DirectoryOutput(dst)
+        # ensure images dir
+        os.makedirs(os.path.join(dst, 'images'), exist_ok=True)
+    for src_file, dst_file in discover_static(src, dst):
+        rel = os.path.relpath(dst_file, dst)
+        if assets is not None:
+            rel = assets.name(rel)
+            dst_file = os.path.join(dst, rel)
+        copied[rel] = src_file
+        ext = os.path.splitext(dst_file)[1].lower()
+        params = static_params(rel, minify)
+        if graph is not None and not graph.is_stale(rel, [src_file], params):
+            graph.keep(rel)
+            continue
+        if params:
+            print(f"Minifying {src_file} to {dst_file}")
+            with open(src_file, 'r', encoding='utf-8') as f:
+                text = f.read()
+            text = minify_css_cached(text) if ext == '.css' else minify_html(text)
+            sha256 = output.write(rel, [text])
+        else:
             print(f"Copying {src_file} to {dst_file}")
-            shutil.copy(src_file, dst_file)
+            output.copy(rel, src_file)
+            # a copy has the same content hash as its source
+            sha256 = graph.digest(src_file) if graph is not None else None
+        if graph is not None:
+            graph.record(rel, [src_file], params, sha256)
+    return copied
 
-# Generate HTML page from markdown using template
-def generate_page(from_path, template_path, dest_path, basepath='/'):
+# rendered blocks shared by every page this process renders, so editing one
+# paragraph of a large page (daemon, repeated builds) re-renders one block
+block_cache = BlockCache()
+
+def render_chunks(md, template, basepath='/', on_link=None, assets=None):
+    """
+    Yields the full page for markdown rendered into a compiled template,
+    chunk by chunk: only the node tree is held, never the whole document.
+    on_link, if given, is called with (url, source line) for every link
+    and image while the markdown is parsed. assets, an optional
+    assets.AssetMap, points static URLs at their fingerprinted names.
+    """
+    # front matter is metadata, not content
+    _, body = split_front_matter(md)
+    if on_link is not None and body is not md:
+        offset = md.count('\n') - body.count('\n')
+        report = on_link
+        on_link = lambda url, line: report(url, line + offset)
+    md = body
+    # convert markdown to an HTML node tree, resolving link/image URLs
+    node = markdown_to_html_node(md, get_resolver(basepath, assets), block_cache, on_link)
+    # extract title
+    title = extract_title(md)
+    # fill placeholders while serializing
+    return template.render(title, node.iter_html())
+
+def render_page(md, template, basepath='/'):
+    """
+    Renders markdown into the template and returns the full page HTML.
+    template is a Template or the raw template text.
+    """
+    if isinstance(template, str):
+        template = Template(template, get_resolver(basepath))
+    return "".join(render_chunks(md, template, basepath))
+
+# Generate HTML page from markdown using template; returns the page's sha256.
+# With an output backend, dest_path is relative to it
+def generate_page(from_path, template_path, dest_path, basepath='/', minify=False, on_link=None, output=None,
+                  assets=None):
     print(f"Generating page from {from_path} to {dest_path} using {template_path}")
     # read markdown
     with open(from_path, 'r', encoding='utf-8') as f:
         md = f.read()
-    # read template
-    with open(template_path, 'r', encoding='utf-8') as f:
-        tpl = f.read()
-    # convert markdown to HTML
-    node = markdown_to_html_node(md)
-    content_html = node.to_html()
-    # extract title
-    title = extract_title(md)
-    # replace placeholders
-    html = tpl.replace('{{ Title }}', title).replace('{{ Content }}', content_html)
-    # update paths in href and src attributes
-    if basepath != '/':
-        # Ensure basepath starts and ends with /
-        if not basepath.startswith('/'):
-            basepath = '/' + basepath
-        if not basepath.endswith('/'):
-            basepath = basepath + '/'
-        html = html.replace('href="/', f'href="{basepath}').replace('src="/', f'src="{basepath}')
-    # ensure dest directory exists
-    os.makedirs(os.path.dirname(dest_path), exist_ok=True)
-    # write output
-    with open(dest_path, 'w', encoding='utf-8') as f:
-        f.write(html)
-
-def generate_pages_recursive(dir_path_content, template_path, dest_dir_path, basepath='/'):
+    template = load_template(template_path, basepath, assets)
+    chunks = render_chunks(md, template, basepath, on_link, assets)
+    if minify:
+        chunks = minify_html_chunks(chunks)
+    # stream the page straight to disk (or the output backend)
+    if output is not None:
+        return output.write(dest_path, chunks)
+    return write_chunks(dest_path, chunks)
+
+def discover_pages(dir_path_content, dest_dir_path):
     """
-    Recursively generate HTML pages from markdown files in the content directory.
-    
-    Args:
-        dir_path_content: Path to the content directory
-        template_path: Path to the HTML template file
-        dest_dir_path: Path to the public directory where HTML files will be written
+    Lists the (markdown source, html destination) pairs under the content
+    directory, sorted so that every machine sees the same order.
     """
-    # Ensure the destination directory exists
-    os.makedirs(dest_dir_path, exist_ok=True)
-    
-    # Process all items in the content directory
-    for item in os.listdir(dir_path_content):
+    pages = []
+    for item in sorted(os.listdir(dir_path_content)):
         src_path = os.path.join(dir_path_content, item)
-        
+
         if os.path.isfile(src_path) and src_path.endswith('.md'):
-            # For markdown files, generate corresponding HTML
             if item == 'index.md':
                 # For index.md, generate index.html in the current directory
                 dest_path = os.path.join(dest_dir_path, 'index.html')
             else:
                 # For other markdown files, generate .html file in the same directory
                 dest_path = os.path.join(dest_dir_path, os.path.splitext(item)[0] + '.html')
-            
-            generate_page(src_path, template_path, dest_path, basepath)
-            
+            pages.append((src_path, dest_path))
+
         elif os.path.isdir(src_path):
-            # For directories, create corresponding directory in destination and recurse
-            new_dest_dir = os.path.join(dest_dir_path, item)
-            generate_pages_recursive(src_path, template_path, new_dest_dir, basepath)
+            # For directories, recurse with the corresponding destination directory
+            pages.extend(discover_pages(src_path, os.path.join(dest_dir_path, item)))
+    return pages
 
-def main():
-    # Get basepath from command line argument or use default '/'
-    basepath = sys.argv[1] if len(sys.argv) > 1 else '/'
-    
-    # Set up paths
-    project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
-    static_dir = os.path.join(project_root, 'static')
-    public_dir = os.path.join(project_root, 'docs')  # Changed from 'public' to 'docs' for GitHub Pages
-    content_dir = os.path.join(project_root, 'content')
-    template_path = os.path.join(project_root, 'template.html')
-    
-    # Clear and copy static files
-    print("Copying static files...")
-    copy_static(static_dir, public_dir)
+def generate_pages_recursive(dir_path_content, template_path, dest_dir_path, basepath='/', pages=None, graph=None, minify=False,
+                             checker=None, output=None, layouts=None, assets=None):
+    """
+    Recursively generate HTML pages from markdown files in the content directory.
     
+    Args:
+        dir_path_content: Path to the content directory
+        template_path: Path to the HTML template file
+        dest_dir_path: Path to the public directory where HTML files will be written
+        basepath: Root URL the site is served from
+        pages: Optional subset of discover_pages() to render (e.g. one shard)
+        graph: Optional DependencyGraph; pages whose inputs are unchanged are skipped
+        minify: Minify the HTML while it is written
+        checker: Optional LinkChecker fed every link and image URL
+        output: Optional output backend dest_dir_path is written through
+        layouts: Optional LayoutResolver picking each page's template
+                 (default: per-directory _layout.html, else template_path)
+        assets: Optional assets.AssetMap of fingerprinted static files
+
+    Returns a dict mapping each generated file (relative to dest_dir_path) to its source.
+    """
+    if output is None:
+        # Ensure the destination directory exists
+        os.makedirs(dest_dir_path, exist_ok=True)
+        output = DirectoryOutput(dest_dir_path)
+    if layouts is None:
+        layouts = LayoutResolver(dir_path_content, template_path)
+    if pages is None:
+        pages = discover_pages(dir_path_content, dest_dir_path)
+
+    generated = {}
+    params = {'basepath': basepath}
+    if minify:
+        params['minify'] = True
+    for src_path, dest_path in pages:
+        rel = os.path.relpath(dest_path, dest_dir_path)
+        generated[rel] = src_path
+        # the page's layout and its partials are inputs too
+        layout = layouts.resolve(src_path, read_front_matter(src_path))
+        template = load_template(layout, basepath, assets)
+        inputs = [src_path, layout, *template.includes]
+        source = os.path.relpath(src_path, os.path.dirname(dir_path_content))
+        page_params = params
+        if assets is not None and graph is not None and rel in graph.previous:
+            # an unchanged page references the assets it linked to last time
+            page_params = page_asset_params(params, assets, template, graph.previous[rel].get('links', []))
+        if graph is not None and not graph.is_stale(rel, inputs, page_params):
+            graph.keep(rel)
+            # unchanged pages replay the links recorded when they were parsed
+            if checker is not None:
+                for url, line in graph.previous[rel].get('links', []):
+                    checker.check(source, line, url)
+            continue
+        links = []
+        def on_link(url, line):
+            links.append([url, line])
+            if checker is not None:
+                checker.check(source, line, url)
+        sha256 = generate_page(src_path, layout, rel, basepath, minify, on_link, output, assets)
+        if graph is not None:
+            if assets is not None:
+                page_params = page_asset_params(params, assets, template, links)
+            graph.record(rel, inputs, page_params, sha256, links)
+    return generated
+
+def page_asset_params(params, assets, template, links):
+    # a page embeds the hashed names of the assets its markdown and its
+    # template reference, and only those
+    return dict(params, assets=assets.key_for([*template.urls, *(url for url, _ in links)]))
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Generate the static site.")
+    parser.add_argument('basepath', nargs='?', default='/', help="root URL the site is served from")
+    parser.add_argument('--output', help="output directory (default: docs/)")
+    parser.add_argument('--archive', metavar='PATH',
+                        help="write the site into a .tar, .tar.gz, .tgz, .tar.bz2, .tar.xz or .zip "
+                             "archive instead of the output directory")
+    parser.add_argument('--shard', help="render only shard i of N, e.g. 2/4")
+    parser.add_argument('--shard-strategy', choices=('hash', 'cost'), default='hash',
+                        help="split pages by stable path hash or by balanced estimated cost")
+    parser.add_argument('--clean', action='store_true',
+                        help="wipe the output directory and rebuild everything")
+    parser.add_argument('--minify', action='store_true', help="minify generated HTML and copied CSS")
+    parser.add_argument('--fingerprint', action='store_true',
+                        help="emit static files as name.<hash>.ext and rewrite references to them")
+    parser.add_argument('--site-url', default='',
+                        help="absolute site URL used in sitemap.xml and feed.xml, e.g. https://example.com")
+    parser.add_argument('--check-links', choices=('off', 'warn', 'error'), default='warn',
+                        help="report broken internal links as warnings or fail the build")
+    parser.add_argument('--changes', choices=('git', 'hash'), default='git',
+                        help="detect changed inputs with git (falls back to hashing) or always hash")
+    parser.add_argument('--merge', nargs='+', metavar='SHARD_DIR',
+                        help="merge shard build outputs into the output directory")
+    return parser.parse_args(argv)
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+def default_config(project_root=PROJECT_ROOT):
+    """
+    Returns the build configuration for a project laid out like this repo.
+    Every key can be overridden before passing the dict to build_site().
+    """
+    return {
+        'root': project_root,
+        'static_dir': os.path.join(project_root, 'static'),
+        'content_dir': os.path.join(project_root, 'content'),
+        'template_path': os.path.join(project_root, 'template.html'),
+        'layouts_dir': os.path.join(project_root, 'layouts'),
+        'output_dir': os.path.join(project_root, 'docs'),  # Changed from 'public' to 'docs' for GitHub Pages
+        'basepath': '/',
+        'shard': None,
+        'shard_strategy': 'hash',
+        'search': True,
+        'clean': False,
+        'minify': False,
+        'fingerprint': False,
+        'blog': True,
+        'blog_page_size': 10,
+        'site_url': '',
+        'site_title': 'Blog',
+        'check_links': 'warn',
+        'changes': 'git',
+        'archive': None,
+        'output': None,  # an output backend to build through, see output.py
+    }
+
+def build_site(config):
+    """
+    Builds the site described by config (see default_config) and returns
+    the dict of generated outputs, relative to the output directory.
+    With config['archive'] set, the site is written into that archive;
+    with config['output'] set to an output backend (e.g. an
+    output.MemoryOutput), through that backend instead of the directory.
+    """
+    public_dir = config['output_dir']
+    shard = parse_shard(config['shard']) if config.get('shard') else None
+    root = config.get('root', PROJECT_ROOT)
+    archive = config.get('archive')
+    if archive and shard is not None:
+        raise ValueError("an archive build can't be sharded")
+
+    if config.get('output') is not None:
+        # A caller-provided backend keeps its own build state
+        output = config['output']
+        graph = DependencyGraph.load(root, public_dir, output)
+    elif archive:
+        # An archive is always complete: nothing is carried over, and
+        # output paths stay relative to output_dir without touching it
+        print(f"Writing archive {archive}")
+        output = ArchiveOutput(archive)
+        graph = DependencyGraph(root, public_dir, output=output)
+    else:
+        # Outputs are rebuilt only when their inputs changed; --clean starts over
+        if config.get('clean'):
+            clean_output(public_dir)
+        os.makedirs(public_dir, exist_ok=True)
+        output = DirectoryOutput(public_dir)
+        graph = DependencyGraph.load(root, public_dir)
+    with output:
+        return _build(config, shard, graph, output)
+
+def _build(config, shard, graph, output):
+    basepath = config['basepath']
+    public_dir = config['output_dir']
+    content_dir = config['content_dir']
+    root = config.get('root', PROJECT_ROOT)
+
+    # Let git say which inputs changed since the last build's commit so
+    # unchanged ones are neither hashed nor parsed (picking a page's layout
+    # still reads its front matter line); otherwise every input is hashed
+    commit = None
+    if config.get('changes', 'git') == 'git' and output.incremental:
+        inputs = [path for path in (content_dir, config['static_dir'], config['template_path'],
+                                    config.get('layouts_dir')) if path and os.path.exists(path)]
+        changed, commit = detect_changes(root, graph.commit, inputs)
+        if changed is None:
+            print("Change detection: hashing all inputs")
+        else:
+            print(f"Change detection: {len(changed)} input(s) changed since {graph.commit[:12]}")
+            graph.trust_unchanged(changed, inputs)
+
+    # Every shard needs the asset names, but only the first ships the files
+    assets = build_asset_map(config, graph)
+
+    # Copy static files (only the first shard ships them)
+    outputs = {}
+    if shard is None or shard[0] == 1:
+        print("Copying static files...")
+        outputs.update(copy_static(config['static_dir'], public_dir, graph, config.get('minify', False), output,
+                                   assets))
+        if assets is not None:
+            outputs.update(write_asset_manifest(graph, output, assets))
+
+    pages = discover_pages(content_dir, public_dir)
+    checker = None
+    if config.get('check_links', 'warn') != 'off':
+        checker = build_link_checker(config, pages)
+    if shard is not None:
+        pages = select_shard(pages, shard[0], shard[1], content_dir, config.get('shard_strategy', 'hash'))
+        print(f"Shard {config['shard']}: {len(pages)} page(s)")
+
     # Generate all pages recursively
     print(f"Generating HTML pages with basepath: '{basepath}'...")
-    generate_pages_recursive(content_dir, template_path, public_dir, basepath)
-    
+    layouts = build_layout_resolver(config)
+    outputs.update(generate_pages_recursive(content_dir, config['template_path'], public_dir, basepath, pages, graph,
+                                            config.get('minify', False), checker, output, layouts, assets))
+
+    # Listings, sitemap and feed need every page, so shards get them on merge
+    if shard is None and config.get('blog', True):
+        outputs.update(build_blog_outputs(config, graph, output, assets))
+
+    # Delete outputs whose sources are gone, then persist the graph
+    if output.incremental:
+        graph.remove_orphans()
+        graph.save(config.get('shard'), commit)
+
+    # Shards are indexed once they have been merged
+    if shard is None and config.get('search', True):
+        build_search_index(content_dir, public_dir, basepath, output, graph)
+
+    if checker is not None and checker.broken:
+        problems = checker.report()
+        fatal = config.get('check_links') == 'error'
+        for problem in problems:
+            print(f"{'Error' if fatal else 'Warning'}: {problem}")
+        if fatal:
+            raise BrokenLinks(f"{len(problems)} broken internal link(s)")
+    return outputs
+
+def build_link_checker(config, pages):
+    """
+    Indexes every URL the full build produces (all pages, static files
+    and generated listings), before anything is rendered.
+    """
+    public_dir = config['output_dir']
+    checker = LinkChecker()
+    for _, dest_path in pages:
+        checker.add(os.path.relpath(dest_path, public_dir))
+    for _, dst_file in discover_static(config['static_dir'], public_dir):
+        checker.add(os.path.relpath(dst_file, public_dir))
+    blog_dir = os.path.join(config['content_dir'], 'blog')
+    if config.get('blog', True) and os.path.isdir(blog_dir):
+        for rel in listing_pages(blog_dir, 'blog', config.get('blog_page_size', 10)) + ['feed.xml', 'sitemap.xml']:
+            checker.add(rel)
+    return checker
+
+def build_asset_map(config, graph):
+    if not config.get('fingerprint'):
+        return None
+    print("Fingerprinting static files...")
+    return fingerprint_assets(config['static_dir'], config['output_dir'], graph, config.get('minify', False))
+
+def write_asset_manifest(graph, output, assets):
+    # asset-manifest.json maps each static file to its fingerprinted name
+    params = {'assets': assets.key}
+    if graph.is_stale(ASSET_MANIFEST, [], params):
+        graph.record(ASSET_MANIFEST, [], params, output.write(ASSET_MANIFEST, [assets.manifest()]))
+    else:
+        graph.keep(ASSET_MANIFEST)
+    return {ASSET_MANIFEST: None}
+
+def build_layout_resolver(config):
+    return LayoutResolver(config['content_dir'], config['template_path'], config.get('layouts_dir'))
+
+def build_blog_outputs(config, graph, output=None, assets=None):
+    content_dir = config['content_dir']
+    basepath = config['basepath']
+    print("Updating blog listings, sitemap and feed...")
+    page_urls = [page_url(os.path.relpath(src, content_dir))
+                 for src, _ in discover_pages(content_dir, config['output_dir'])]
+    # listings use the blog directory's layout, like the posts around them
+    layout = build_layout_resolver(config).for_directory(os.path.join(content_dir, 'blog'))
+    return build_blog(content_dir, config['output_dir'], page_urls,
+                      load_template(layout, basepath, assets), layout,
+                      get_resolver(basepath, assets), graph,
+                      page_size=config.get('blog_page_size', 10),
+                      site_url=config.get('site_url', ''),
+                      site_title=config.get('site_title', 'Blog'),
+                      output=output,
+                      minify=config.get('minify', False))
+
+def build_search_index(content_dir, public_dir, basepath='/', output=None, graph=None):
+    # Build the search index from the same content tree; with a graph,
+    # sources it knows to be unchanged are not read again
+    print("Updating search index...")
+    url_prefix = '/' + basepath.strip('/') + '/' if basepath.strip('/') else '/'
+    updated = update_search_index_from_files(page_sources(content_dir, url_prefix), 'search',
+                                             output or DirectoryOutput(public_dir),
+                                             graph.digest if graph is not None else file_digest)
+    print(f"Search index updated for {updated} page(s)")
+
+def merge_site(config, shard_dirs):
+    """
+    Merges shard build outputs into config['output_dir'], then adds the
+    outputs that need every page: blog listings, sitemap, feed and the
+    search index.
+    """
+    print(f"Merging {len(shard_dirs)} shard(s) into {config['output_dir']}...")
+    merge_shards(shard_dirs, config['output_dir'])
+    graph = DependencyGraph.load(config['root'], config['output_dir'])
+    if config.get('blog', True):
+        build_blog_outputs(config, graph, assets=build_asset_map(config, graph))
+    # the merged pages and static files stay in the manifest
+    graph.keep_unrecorded()
+    graph.save()
+    if config.get('search', True):
+        build_search_index(config['content_dir'], config['output_dir'], config['basepath'], graph=graph)
+
+def main(argv=None):
+    # Get basepath and options from the command line
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    config = default_config()
+    config['basepath'] = args.basepath
+    config['shard'] = args.shard
+    config['shard_strategy'] = args.shard_strategy
+    config['clean'] = args.clean
+    config['minify'] = args.minify
+    config['fingerprint'] = args.fingerprint
+    config['site_url'] = args.site_url
+    config['check_links'] = args.check_links
+    config['changes'] = args.changes
+    config['archive'] = args.archive
+    if args.output:
+        config['output_dir'] = args.output
+
+    if args.merge:
+        merge_site(config, args.merge)
+    else:
+        try:
+            build_site(config)
+        except BrokenLinks as e:
+            # the broken links were listed above
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
+        if args.shard:
+            print(f"Shard {args.shard} complete!")
+            return 0
+
     print("Site generation complete!")
+    return 0
 
-main()
\ No newline at end of file
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,187 @@
+import re
+import hashlib
+
+# elements whose text is whitespace-sensitive and passed through untouched
+PRESERVE_TAGS = ("pre", "code", "textarea", "script", "style")
+
+# elements that don't flow inline, so whitespace next to them never renders
+BLOCK_TAGS = frozenset(
+    "html head body title meta link base script style noscript template "
+    "div p h1 h2 h3 h4 h5 h6 ul ol li dl dt dd blockquote pre hr br table "
+    "caption colgroup col thead tbody tfoot tr td th header footer main nav "
+    "section article aside figure figcaption form fieldset legend details "
+    "summary address".split()
+)
+
+_HTML_TOKEN_RE = re.compile(r"<!--.*?-->|<[^>]*>|[^<]+|<", re.S)
+_TAG_NAME_RE = re.compile(r"<(/?)([a-zA-Z][a-zA-Z0-9]*)")
+_WS_RE = re.compile(r"\s+")
+
+
+class HTMLMinifier:
+    """
+    Single-pass streaming HTML minifier.
+
+    feed() takes chunks as they are serialized and returns the minified
+    output so far; a tag, comment or text run that may continue in the next
+    chunk is held back until it is complete, so the result does not depend
+    on where chunks are split. Outside preserved elements, runs of
+    whitespace collapse to one space, whitespace-only runs containing a
+    newline (template indentation) are dropped next to block-level tags
+    (see BLOCK_TAGS) and collapse to one space between inline content, and
+    comments are removed. Tags are emitted as-is.
+    """
+
+    def __init__(self):
+        self.pending = ""
+        self.preserve_depth = 0
+        self.last_space = True
+        # after a block-level tag, and before a newline run whose fate
+        # depends on the next tag
+        self.after_block = True
+        self.pending_space = False
+
+    def feed(self, chunk, final=False):
+        data = self.pending + chunk
+        self.pending = ""
+        out = []
+        for match in _HTML_TOKEN_RE.finditer(data):
+            token = match.group()
+            if not final and match.end() == len(data) and token[0] != "<":
+                # text may continue in the next chunk
+                self.pending = token
+                break
+            if token[0] == "<":
+                if token == "<" or (token.startswith("<!--") and not token.endswith("-->")):
+                    if final:
+                        out.append(data[match.start():])
+                        break
+                    # incomplete tag or comment: wait for the next chunk
+                    self.pending = data[match.start():]
+                    break
+                if token.startswith("<!--"):
+                    if token.startswith("<!--["):
+                        out.append(token)
+                    continue
+                block = _is_block(token)
+                if self.pending_space and not block:
+                    out.append(" ")
+                self.pending_space = False
+                self._track(token)
+                out.append(token)
+                self.last_space = False
+                self.after_block = block
+            elif self.preserve_depth:
+                out.append(token)
+                self.last_space = token[-1].isspace()
+                self.after_block = False
+            elif token.isspace():
+                if "\n" not in token:
+                    if not self.last_space:
+                        out.append(" ")
+                        self.last_space = True
+                elif not self.last_space and not self.after_block:
+                    # kept as one space unless a block-level tag follows
+                    self.pending_space = True
+            else:
+                if self.pending_space:
+                    token = " " + token
+                    self.pending_space = False
+                self.after_block = False
+                text = _WS_RE.sub(" ", token)
+                if self.last_space and text[0] == " ":
+                    text = text[1:]
+                out.append(text)
+                self.last_space = text.endswith(" ")
+        return "".join(out)
+
+    def flush(self):
+        return self.feed("", final=True)
+
+    def _track(self, tag):
+        match = _TAG_NAME_RE.match(tag)
+        if match is None or match.group(2).lower() not in PRESERVE_TAGS:
+            return
+        if match.group(1):
+            self.preserve_depth = max(0, self.preserve_depth - 1)
+        elif not tag.endswith("/>"):
+            self.preserve_depth += 1
+
+
+def _is_block(tag):
+    match = _TAG_NAME_RE.match(tag)
+    # doctypes and processing instructions sit between blocks too
+    return match is None or match.group(2).lower() in BLOCK_TAGS
+
+
+def minify_html_chunks(chunks):
+    """Wraps a chunk iterator so the output is minified while streaming."""
+    minifier = HTMLMinifier()
+    for chunk in chunks:
+        out = minifier.feed(chunk)
+        if out:
+            yield out
+    rest = minifier.flush()
+    if rest:
+        yield rest
+
+
+def minify_html(html):
+    return HTMLMinifier().feed(html, final=True)
+
+
+# whitespace around these characters is never significant in CSS
+_CSS_TIGHT = set("{};,>")
+
+
+def minify_css(css):
+    """
+    Single-pass CSS minifier: strips comments, collapses whitespace, drops
+    it around punctuation and removes the last semicolon of each block.
+    String literals are copied verbatim.
+    """
+    out = []
+    i = 0
+    n = len(css)
+    space = False
+    while i < n:
+        c = css[i]
+        if c == "/" and css.startswith("/*", i):
+            end = css.find("*/", i + 2)
+            i = n if end == -1 else end + 2
+            space = True
+            continue
+        if c.isspace():
+            space = True
+            i += 1
+            continue
+        if c in "\"'":
+            end = i + 1
+            while end < n and css[end] != c:
+                end += 2 if css[end] == "\\" else 1
+            token = css[i:end + 1]
+            i = end + 1
+        else:
+            token = c
+            i += 1
+        if space and out and out[-1][-1] not in _CSS_TIGHT and out[-1] != ":" and token not in _CSS_TIGHT:
+            out.append(" ")
+        space = False
+        if token == "}" and out and out[-1] == ";":
+            out.pop()
+        out.append(token)
+    return "".join(out)
+
+
+# minified output keyed by sha256 of the source, shared by every build in
+# this process so unchanged files are never minified twice
+_css_cache = {}
+
+
+def minify_css_cached(css):
+    key = hashlib.sha256(css.encode("utf-8")).hexdigest()
+    minified = _css_cache.get(key)
+    if minified is None:
+        minified = minify_css(css)
+        _css_cache[key] = minified
+    return minified
@@ -0,0 +1,243 @@
+import os
+import io
+import bz2
+import gzip
+import lzma
+import time
+import shutil
+import tarfile
+import zipfile
+import tempfile
+from template import write_chunks, stream_chunks
+
+# 1980-01-01, the earliest time a zip entry can carry
+DEFAULT_EPOCH = 315532800
+
+ARCHIVE_SUFFIXES = (".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tar.xz", ".zip")
+
+
+class DirectoryOutput:
+    """
+    Writes outputs as files under root. Every output backend takes paths
+    relative to its root, with "/" or os.sep separators. Backends that
+    keep the previous build's outputs and state are incremental.
+    """
+
+    incremental = True
+
+    def __init__(self, root):
+        self.root = root
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close(exc_type is None)
+
+    def path(self, rel):
+        return os.path.join(self.root, rel)
+
+    def exists(self, rel):
+        return os.path.exists(self.path(rel))
+
+    def read(self, rel):
+        """Returns the text of an output written by a previous build, or None."""
+        path = self.path(rel)
+        if not os.path.exists(path):
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            return f.read()
+
+    def write(self, rel, chunks):
+        """Streams text chunks to rel and returns their sha256."""
+        return write_chunks(self.path(rel), chunks)
+
+    def copy(self, rel, src_path):
+        dst = self.path(rel)
+        os.makedirs(os.path.dirname(dst), exist_ok=True)
+        shutil.copy(src_path, dst)
+
+    def remove(self, rel):
+        """Deletes rel, pruning directories left empty."""
+        path = self.path(rel)
+        if os.path.exists(path):
+            os.remove(path)
+        parent = os.path.dirname(path)
+        while parent != self.root and os.path.isdir(parent) and not os.listdir(parent):
+            os.rmdir(parent)
+            parent = os.path.dirname(parent)
+
+    def close(self, success=True):
+        pass
+
+
+class MemoryOutput:
+    """
+    Keeps outputs in store, a dict-like mapping of "/"-separated paths to
+    bytes (default: a new dict), so a whole site can be built with no disk
+    I/O beyond reading the sources. Build state (manifest, blog and search
+    indexes) lives in the store too, so building into the same store again
+    is incremental. Each build should get its own store; builds into
+    separate stores can run concurrently.
+    """
+
+    incremental = True
+
+    def __init__(self, store=None):
+        self.files = {} if store is None else store
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close(exc_type is None)
+
+    @staticmethod
+    def key(rel):
+        return rel.replace(os.sep, "/")
+
+    def exists(self, rel):
+        return self.key(rel) in self.files
+
+    def read(self, rel):
+        data = self.files.get(self.key(rel))
+        return None if data is None else data.decode("utf-8")
+
+    def read_bytes(self, rel):
+        return self.files.get(self.key(rel))
+
+    def write(self, rel, chunks):
+        with io.StringIO() as buffer:
+            sha256 = stream_chunks(buffer, chunks)
+            self.files[self.key(rel)] = buffer.getvalue().encode("utf-8")
+        return sha256
+
+    def copy(self, rel, src_path):
+        with open(src_path, "rb") as f:
+            self.files[self.key(rel)] = f.read()
+
+    def remove(self, rel):
+        self.files.pop(self.key(rel), None)
+
+    def close(self, success=True):
+        pass
+
+
+def source_date_epoch():
+    """Timestamp stamped on archive entries: $SOURCE_DATE_EPOCH if set."""
+    value = os.environ.get("SOURCE_DATE_EPOCH")
+    return max(int(value), DEFAULT_EPOCH) if value else DEFAULT_EPOCH
+
+
+class ArchiveOutput:
+    """
+    Streams outputs straight into a tar or zip archive, compressed
+    according to its suffix (see ARCHIVE_SUFFIXES); nothing is written to
+    an output directory.
+
+    Entries are added in build order, which is sorted, and carry a fixed
+    timestamp, mode and owner, so the same inputs give a byte-identical
+    archive. The archive is written next to path and moved into place on
+    a successful close(). Archives hold no state from earlier builds:
+    read() finds nothing, so every build is a full build, and build state
+    (manifest, blog and search indexes) is left out of them.
+    """
+
+    incremental = False
+
+    def __init__(self, path, mtime=None):
+        if not is_archive(path):
+            raise ValueError(f"unsupported archive type: {path} (use {', '.join(ARCHIVE_SUFFIXES)})")
+        self.path = path
+        self.mtime = source_date_epoch() if mtime is None else mtime
+        self.names = set()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._tmp = tempfile.NamedTemporaryFile(dir=directory, prefix=".archive-", delete=False)
+        self._stream = self._tar = self._zip = None
+        if path.endswith(".zip"):
+            self._zip = zipfile.ZipFile(self._tmp, "w", zipfile.ZIP_DEFLATED)
+            return
+        if path.endswith((".tar.gz", ".tgz")):
+            # no file name and a fixed mtime in the gzip header
+            self._stream = gzip.GzipFile(filename="", mode="wb", fileobj=self._tmp, mtime=self.mtime)
+        elif path.endswith(".tar.bz2"):
+            self._stream = bz2.BZ2File(self._tmp, "wb")
+        elif path.endswith(".tar.xz"):
+            self._stream = lzma.LZMAFile(self._tmp, "wb")
+        self._tar = tarfile.open(fileobj=self._stream or self._tmp, mode="w|", format=tarfile.GNU_FORMAT)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close(exc_type is None)
+
+    def _name(self, rel):
+        name = rel.replace(os.sep, "/")
+        if name in self.names:
+            raise ValueError(f"duplicate archive entry: {name}")
+        self.names.add(name)
+        return name
+
+    def exists(self, rel):
+        return rel.replace(os.sep, "/") in self.names
+
+    def read(self, rel):
+        return None
+
+    def _add(self, name, fileobj):
+        if self._zip is not None:
+            info = zipfile.ZipInfo(name, time.gmtime(self.mtime)[:6])
+            info.compress_type = zipfile.ZIP_DEFLATED
+            info.external_attr = 0o100644 << 16
+            with self._zip.open(info, "w") as entry:
+                shutil.copyfileobj(fileobj, entry)
+            return
+        # tar headers carry the size, so the entry is spooled first
+        info = tarfile.TarInfo(name)
+        info.size = fileobj.seek(0, io.SEEK_END)
+        fileobj.seek(0)
+        info.mtime = self.mtime
+        info.mode = 0o644
+        self._tar.addfile(info, fileobj)
+
+    def write(self, rel, chunks):
+        name = self._name(rel)
+        with tempfile.SpooledTemporaryFile(1 << 20) as spool:
+            text = io.TextIOWrapper(spool, encoding="utf-8", newline="")
+            sha256 = stream_chunks(text, chunks)
+            text.flush()
+            spool.seek(0)
+            self._add(name, spool)
+            text.detach()
+        return sha256
+
+    def copy(self, rel, src_path):
+        name = self._name(rel)
+        with open(src_path, "rb") as f:
+            self._add(name, f)
+
+    def remove(self, rel):
+        pass
+
+    def close(self, success=True):
+        if self._tmp is None:
+            return
+        if self._tar is not None:
+            self._tar.close()
+        if self._zip is not None:
+            self._zip.close()
+        if self._stream is not None:
+            self._stream.close()
+        self._tmp.close()
+        if success:
+            os.chmod(self._tmp.name, 0o644)
+            os.replace(self._tmp.name, self.path)
+        else:
+            os.remove(self._tmp.name)
+        self._tmp = None
+
+
+def is_archive(path):
+    return path.endswith(ARCHIVE_SUFFIXES)
@@ -0,0 +1,143 @@
+import re
+import threading
+from textnode import TextNode, TextType
+
+
+class InlineRule:
+    """
+    An inline syntax. pattern is a regex whose groups are passed to build,
+    which returns the TextNode for a match. triggers are the characters a
+    match can start with. A delimiter (like "**") left over in plain text
+    means a section was not closed.
+    """
+
+    def __init__(self, name, pattern, build, triggers, delimiter=None):
+        self.name = name
+        self.pattern = pattern
+        self.build = build
+        self.triggers = triggers
+        self.delimiter = delimiter
+        self.groups = re.compile(pattern).groups
+
+
+class BlockRule:
+    """
+    A block syntax. match(block, lines) tells whether a block is of this
+    type; render(block, children) returns its HTMLNode, where children(text)
+    converts inline text. triggers are the characters such a block can
+    start with, or None if it can start with anything.
+    """
+
+    def __init__(self, name, btype, match, render, triggers=None):
+        self.name = name
+        self.btype = btype
+        self.match = match
+        self.render = render
+        self.triggers = triggers
+
+
+class _Tables:
+    # what RuleRegistry.compile() builds from the registered rules
+    def __init__(self, inline, block, default_block):
+        groups = {}
+        parts = []
+        index = 1
+        for rule in inline:
+            parts.append(f"({rule.pattern})")
+            groups[index] = rule
+            index += 1 + rule.groups
+        self.pattern = re.compile("|".join(parts), re.S) if parts else None
+        self.groups = groups
+        self.triggers = "".join(sorted({c for rule in inline for c in rule.triggers}))
+        self.delimiters = tuple(rule.delimiter for rule in inline if rule.delimiter)
+        self.anywhere = [rule for rule in block if rule.triggers is None]
+        self.dispatch = {}
+        for rule in block:
+            for c in rule.triggers or "":
+                self.dispatch[c] = [r for r in block if r.triggers is None or c in r.triggers]
+        self.by_type = {rule.btype: rule for rule in block}
+        if default_block is not None:
+            self.by_type.setdefault(default_block.btype, default_block)
+
+
+class RuleRegistry:
+    """
+    Block and inline rules, in priority order.
+
+    The inline rules are compiled into one alternation, so inline text is
+    scanned once whatever the number of rules, and text containing none of
+    their trigger characters is not scanned at all. Blocks are dispatched
+    on their first character to the rules that can start with it. Both
+    tables are rebuilt lazily after a rule is added; version changes with
+    every addition so caches of rendered output can tell rule sets apart.
+    """
+
+    def __init__(self, default_block=None):
+        self.inline = []
+        self.block = []
+        self.default_block = default_block
+        self.version = 0
+        self._compiled = None
+        self._lock = threading.Lock()
+
+    def _insert(self, rules, rule, before):
+        if any(r.name == rule.name for r in rules):
+            raise ValueError(f"rule {rule.name!r} is already registered")
+        index = len(rules)
+        if before is not None:
+            index = next((i for i, r in enumerate(rules) if r.name == before), None)
+            if index is None:
+                raise ValueError(f"no rule named {before!r}")
+        rules.insert(index, rule)
+        self.version += 1
+        self._compiled = None
+
+    def add_inline(self, rule, before=None):
+        """Registers an inline rule, last or ahead of the rule named before."""
+        self._insert(self.inline, rule, before)
+
+    def add_block(self, rule, before=None):
+        """Registers a block rule, last or ahead of the rule named before."""
+        self._insert(self.block, rule, before)
+
+    def compile(self):
+        tables = self._compiled
+        if tables is None:
+            with self._lock:
+                tables = self._compiled = _Tables(self.inline, self.block, self.default_block)
+        return tables
+
+    def tokenize(self, text):
+        """Splits inline text into TextNodes in one scan."""
+        tables = self.compile()
+        if tables.pattern is None or not any(c in text for c in tables.triggers):
+            return [TextNode(text, TextType.TEXT)]
+        nodes = []
+        last = 0
+        for match in tables.pattern.finditer(text):
+            start = match.start()
+            if start > last:
+                nodes.append(TextNode(text[last:start], TextType.TEXT))
+            # the rule's own group is the outermost, so it closes last
+            index = match.lastindex
+            rule = tables.groups[index]
+            nodes.append(rule.build(*match.groups()[index:index + rule.groups]))
+            last = match.end()
+        if last < len(text):
+            nodes.append(TextNode(text[last:], TextType.TEXT))
+        for node in nodes:
+            if node.text_type == TextType.TEXT and any(d in node.text for d in tables.delimiters):
+                raise ValueError("invalid markdown, formatted section not closed")
+        return nodes
+
+    def block_rule(self, block):
+        """The first rule matching block, or the default block rule."""
+        tables = self.compile()
+        lines = block.split("\n")
+        for rule in tables.dispatch.get(block[:1], tables.anywhere):
+            if rule.match(block, lines):
+                return rule
+        return self.default_block
+
+    def rule_for_type(self, btype):
+        return self.compile().by_type.get(btype, self.default_block)
@@ -0,0 +1,296 @@
+import os
+import re
+import json
+import hashlib
+from frontmatter import split_front_matter
+from output import DirectoryOutput
+from depgraph import file_digest
+from inline_markdown import (
+    BlockType,
+    block_to_block_type,
+    markdown_to_blocks,
+    text_to_textnodes,
+    extract_title,
+)
+
+# Layout of the generated index (all paths relative to the index directory):
+#   docs.json      list of {"url", "title"} indexed by doc id (null = free slot)
+#   <prefix>.json  {term: [delta-encoded doc ids]} for every term with that prefix
+#   state.json     build-only bookkeeping used for incremental updates
+# A client stems the query term, fetches <term[:PREFIX_LEN]>.json and decodes
+# the posting list, so only the shards touched by a query are ever downloaded.
+PREFIX_LEN = 2
+INDEX_VERSION = 1
+# every shard name a term can map to (terms are runs of [a-z0-9])
+_ALPHABET = "abcdefghijklmnopqrstuvwxyz0123456789"
+ALL_PREFIXES = [a + b for a in _ALPHABET for b in _ALPHABET]
+
+STOP_WORDS = frozenset(
+    "a an and are as at be but by for from has have he her his i if in into is it "
+    "its me my of on or our she so than that the their them then there these they "
+    "this to was we were what when which who will with you your".split()
+)
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+_BLOCK_PREFIX_RE = re.compile(r"^(#{1,6} |>\s?|- |\d+\. )")
+_SUFFIXES = (
+    ("ational", "ate"),
+    ("iveness", "ive"),
+    ("fulness", "ful"),
+    ("ousness", "ous"),
+    ("ization", "ize"),
+    ("ations", "ate"),
+    ("ation", "ate"),
+    ("ness", ""),
+    ("ment", ""),
+    ("ingly", ""),
+    ("edly", ""),
+    ("ies", "y"),
+    ("ing", ""),
+    ("ly", ""),
+    ("ed", ""),
+    ("es", ""),
+    ("s", ""),
+)
+
+
+def stem(word):
+    """
+    Very small suffix-stripping stemmer ("stemmed-lite").
+    Only strips a suffix when at least three characters of stem remain.
+    """
+    for suffix, replacement in _SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            if suffix == "s" and word.endswith("ss"):
+                return word
+            return word[: -len(suffix)] + replacement
+    return word
+
+
+def tokenize(text):
+    """
+    Lowercases, splits on non-alphanumerics, drops stop words and stems.
+    Returns the set of distinct terms.
+    """
+    terms = set()
+    for word in _WORD_RE.findall(text.lower()):
+        if len(word) < 2 or word in STOP_WORDS:
+            continue
+        terms.add(stem(word))
+    return terms
+
+
+def markdown_to_plain_text(markdown):
+    """
+    Collects the plain text of a markdown document from its TextNode stream.
+    Image alt text is included, link URLs are not.
+    """
+    parts = []
+    for block in markdown_to_blocks(markdown):
+        if block_to_block_type(block) == BlockType.CODE:
+            parts.append("\n".join(block.split("\n")[1:-1]))
+            continue
+        for line in block.split("\n"):
+            line = _BLOCK_PREFIX_RE.sub("", line)
+            try:
+                nodes = text_to_textnodes(line)
+            except ValueError:
+                # unbalanced inline markup: index the raw line instead
+                parts.append(line)
+                continue
+            parts.append("".join(node.text for node in nodes))
+    return "\n".join(parts)
+
+
+def encode_postings(doc_ids):
+    """Delta-encodes a sorted list of doc ids."""
+    encoded = []
+    previous = 0
+    for doc_id in doc_ids:
+        encoded.append(doc_id - previous)
+        previous = doc_id
+    return encoded
+
+
+def decode_postings(deltas):
+    """Inverse of encode_postings."""
+    doc_ids = []
+    current = 0
+    for delta in deltas:
+        current += delta
+        doc_ids.append(current)
+    return doc_ids
+
+
+def _read_json(path, default):
+    if not os.path.exists(path):
+        return default
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _shard_path(index_dir, prefix):
+    return os.path.join(index_dir, f"{prefix}.json")
+
+
+def update_search_index(pages, index_dir, output=None):
+    """
+    Brings the search index in index_dir up to date with pages, a dict of
+    page URL to markdown source. Pages whose source hash is unchanged since
+    the previous build are skipped, and only the shards that contain terms
+    of added, changed or removed pages are rewritten. Without a usable
+    state.json the index is rebuilt from scratch.
+    With an output backend (see output.py), index_dir is relative to it;
+    backends that keep no build state get no state.json.
+    Returns the number of pages that were (re)indexed or removed.
+    """
+    hashes = {url: hashlib.sha1(markdown.encode("utf-8")).hexdigest() for url, markdown in pages.items()}
+    return _update_index(hashes, pages.get, index_dir, output)
+
+
+def update_search_index_from_files(sources, index_dir, output=None, digest=file_digest):
+    """
+    Like update_search_index, for sources mapping page URLs to markdown
+    source files. Files are hashed with digest (e.g. DependencyGraph.digest,
+    which trusts git for unchanged files) and only those whose hash changed
+    are read.
+    """
+    hashes = {url: digest(path) for url, path in sources.items()}
+    return _update_index(hashes, lambda url: read_page(sources[url]), index_dir, output)
+
+
+def _update_index(hashes, load, index_dir, output):
+    # hashes maps each page URL to its source hash, load(url) returns the
+    # markdown of a page that needs (re)indexing
+    if output is None:
+        output = DirectoryOutput(index_dir)
+        index_dir = ""
+
+    def read(name, default):
+        data = output.read(os.path.join(index_dir, name))
+        return default if data is None else json.loads(data)
+
+    def write(name, data):
+        output.write(os.path.join(index_dir, name), [json.dumps(data, separators=(",", ":"), sort_keys=True)])
+
+    state = read("state.json", {})
+    reset = state.get("version") != INDEX_VERSION
+    if reset:
+        # without usable state nothing already in the index can be trusted:
+        # start from an empty index and clear every shard it may contain
+        state = {"version": INDEX_VERSION, "pages": {}}
+        docs = []
+    else:
+        docs = read("docs.json", [])
+    old_pages = state["pages"]
+
+    # work out which pages need (re)indexing
+    removed = [url for url in old_pages if url not in hashes]
+    changed = {}
+    for url, page_hash in hashes.items():
+        page_hash = page_hash[:16]
+        entry = old_pages.get(url)
+        if entry is None or entry["hash"] != page_hash:
+            changed[url] = (page_hash, load(url))
+    if not removed and not changed and not reset:
+        return 0
+
+    # drop stale postings from every shard the old versions appeared in
+    affected = set()
+    stale_ids = set()
+    for url in removed + list(changed):
+        entry = old_pages.get(url)
+        if entry is None:
+            continue
+        affected.update(entry["shards"])
+        stale_ids.add(entry["id"])
+
+    for url in removed:
+        docs[old_pages.pop(url)["id"]] = None
+    free_ids = [doc_id for doc_id, doc in enumerate(docs) if doc is None]
+
+    new_terms = {}
+    for url, (page_hash, markdown) in changed.items():
+        entry = old_pages.get(url)
+        if entry is not None:
+            doc_id = entry["id"]
+        elif free_ids:
+            doc_id = free_ids.pop(0)
+        else:
+            doc_id = len(docs)
+            docs.append(None)
+        try:
+            title = extract_title(markdown)
+        except ValueError:
+            title = url
+        docs[doc_id] = {"url": url, "title": title}
+        terms = tokenize(markdown_to_plain_text(markdown))
+        new_terms[doc_id] = terms
+        shards = sorted({term[:PREFIX_LEN] for term in terms})
+        affected.update(shards)
+        old_pages[url] = {"id": doc_id, "hash": page_hash, "shards": shards}
+
+    # rewrite only the affected shards
+    for prefix in ALL_PREFIXES if reset else sorted(affected):
+        name = f"{prefix}.json"
+        postings = {} if reset else {
+            term: set(decode_postings(deltas)) - stale_ids
+            for term, deltas in read(name, {}).items()
+        }
+        for doc_id, terms in new_terms.items():
+            for term in terms:
+                if term[:PREFIX_LEN] == prefix:
+                    postings.setdefault(term, set()).add(doc_id)
+        shard = {term: encode_postings(sorted(ids)) for term, ids in postings.items() if ids}
+        if shard:
+            write(name, shard)
+        else:
+            output.remove(os.path.join(index_dir, name))
+
+    while docs and docs[-1] is None:
+        docs.pop()
+    write("docs.json", docs)
+    # state.json is build bookkeeping, not part of the deployed index
+    if output.incremental:
+        write("state.json", state)
+    return len(removed) + len(changed)
+
+
+def lookup(index_dir, word):
+    """
+    Returns the URLs of pages containing word, reading only the shard for
+    its prefix. Mirrors what a browser client does with the index.
+    """
+    terms = tokenize(word)
+    if not terms:
+        return []
+    term = terms.pop()
+    shard = _read_json(_shard_path(index_dir, term[:PREFIX_LEN]), {})
+    docs = _read_json(os.path.join(index_dir, "docs.json"), [])
+    return [docs[doc_id]["url"] for doc_id in decode_postings(shard.get(term, []))]
+
+
+def read_page(path):
+    """The markdown body (without front matter) of a source file."""
+    with open(path, "r", encoding="utf-8") as f:
+        return split_front_matter(f.read())[1]
+
+
+def page_sources(dir_path_content, url_prefix="/"):
+    """
+    Lists every markdown page under dir_path_content, as a dict of the URL
+    generate_pages_recursive gives its output to the source path.
+    """
+    pages = {}
+    for item in sorted(os.listdir(dir_path_content)):
+        src_path = os.path.join(dir_path_content, item)
+        if os.path.isfile(src_path) and src_path.endswith(".md"):
+            if item == "index.md":
+                url = url_prefix
+            else:
+                url = url_prefix + os.path.splitext(item)[0] + ".html"
+            pages[url] = src_path
+        elif os.path.isdir(src_path):
+            pages.update(page_sources(src_path, url_prefix + item + "/"))
+    return pages
+
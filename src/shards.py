@@ -0,0 +1,90 @@
+import os
+import shutil
+import hashlib
+from depgraph import read_manifest, write_manifest
+
+
+def parse_shard(spec):
+    """
+    Parses a "i/N" shard spec (1-based) into an (index, count) tuple.
+    Raises ValueError for malformed or out-of-range specs.
+    """
+    try:
+        index, count = (int(part) for part in spec.split("/"))
+    except ValueError:
+        raise ValueError(f"invalid shard spec '{spec}', expected i/N")
+    if count < 1 or not 1 <= index <= count:
+        raise ValueError(f"invalid shard spec '{spec}', need 1 <= i <= N")
+    return index, count
+
+
+def stable_hash(key):
+    """Process-independent hash of a string (unlike the builtin hash())."""
+    return int.from_bytes(hashlib.sha1(key.encode("utf-8")).digest()[:8], "big")
+
+
+def select_shard(pages, index, count, root, strategy="hash"):
+    """
+    Returns the subset of pages assigned to shard index of count.
+
+    pages is a list of (src_path, dest_path) tuples and root is the content
+    directory, used to key pages by a machine-independent relative path.
+    "hash" assigns each page by a stable hash of that path. "cost" balances
+    shards by estimated cost (source size), assigning the most expensive
+    pages first to the least loaded shard; ties break on path so every
+    runner computes the same split.
+    """
+    keyed = [(os.path.relpath(src, root).replace(os.sep, "/"), src, dest) for src, dest in pages]
+    if strategy == "hash":
+        return [(src, dest) for key, src, dest in keyed if stable_hash(key) % count == index - 1]
+    if strategy != "cost":
+        raise ValueError(f"unknown shard strategy: {strategy}")
+    costs = sorted(((os.path.getsize(src), key, src, dest) for key, src, dest in keyed),
+                   key=lambda item: (-item[0], item[1]))
+    loads = [0] * count
+    selected = []
+    for cost, key, src, dest in costs:
+        target = min(range(count), key=lambda i: (loads[i], i))
+        loads[target] += cost + 1
+        if target == index - 1:
+            selected.append((src, dest))
+    selected.sort(key=lambda item: item[0])
+    return selected
+
+
+def merge_shards(shard_dirs, dest_dir):
+    """
+    Combines the outputs of several shard builds into dest_dir.
+
+    Every file listed in a shard manifest is copied over and the manifests
+    are merged into one. Two shards producing the same output path with
+    different content is a collision and raises ValueError before anything
+    is written; identical duplicates are tolerated. dest_dir is replaced,
+    so it can't be one of the shard directories.
+    """
+    dest_real = os.path.realpath(dest_dir)
+    for shard_dir in shard_dirs:
+        if os.path.realpath(shard_dir) == dest_real:
+            raise ValueError(f"can't merge shard {shard_dir} into itself; pick another output directory")
+    merged = {}
+    owners = {}
+    collisions = []
+    for shard_dir in shard_dirs:
+        for rel, entry in read_manifest(shard_dir)["outputs"].items():
+            if rel in merged:
+                if merged[rel]["sha256"] != entry["sha256"]:
+                    collisions.append(f"{rel} ({owners[rel]} vs {shard_dir})")
+                continue
+            merged[rel] = entry
+            owners[rel] = shard_dir
+    if collisions:
+        raise ValueError("shard outputs collide: " + ", ".join(collisions))
+
+    if os.path.exists(dest_dir):
+        shutil.rmtree(dest_dir)
+    os.makedirs(dest_dir)
+    for rel in sorted(merged):
+        dst_file = os.path.join(dest_dir, rel)
+        os.makedirs(os.path.dirname(dst_file), exist_ok=True)
+        shutil.copy(os.path.join(owners[rel], rel), dst_file)
+    return write_manifest(dest_dir, merged)
@@ -0,0 +1,58 @@
+import os
+import subprocess
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+
+from main import default_config, build_site
+
+
+class SiteTestCase(unittest.TestCase):
+    """
+    A test case with a throwaway project directory (self.root, built into
+    self.out) and helpers to write its sources, build it and read the
+    outputs.
+    """
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        self.out = os.path.join(self.root, "docs")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, rel, text):
+        path = os.path.join(self.root, rel)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(text)
+        return path
+
+    def read(self, rel):
+        with open(os.path.join(self.out, rel)) as f:
+            return f.read()
+
+    def config(self, **overrides):
+        """default_config for the project, without the search index."""
+        config = default_config(self.root)
+        config["search"] = False
+        config.update(overrides)
+        return config
+
+    def build(self, **overrides):
+        """Builds the project and returns the build log."""
+        with redirect_stdout(StringIO()) as log:
+            build_site(self.config(**overrides))
+        return log.getvalue()
+
+    def git(self, *args):
+        return subprocess.run(["git", "-c", "user.name=test", "-c", "user.email=test@example.com", *args],
+                              cwd=self.root, check=True, capture_output=True, text=True).stdout.strip()
+
+    def commit(self, message):
+        """Commits everything in the project and returns the new HEAD."""
+        self.git("add", "-A")
+        self.git("commit", "-q", "-m", message)
+        return self.git("rev-parse", "HEAD")
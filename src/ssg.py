@@ -0,0 +1,71 @@
+"""
+Importable API for the site generator.
+
+Importing this module does no work: the markdown and build modules are
+only loaded on first use, so services can import it at startup for free.
+
+    import ssg
+    html = ssg.render_markdown("# Hello")
+    for html in ssg.render_many(documents):
+        ...
+    config = ssg.default_config("/path/to/site")
+    ssg.build_site(config)
+    site = ssg.build_in_memory(config)
+    html = site.read("index.html")
+"""
+
+__all__ = ["render_markdown", "render_many", "default_config", "build_site", "build_in_memory"]
+
+
+def render_markdown(markdown):
+    """Renders a markdown string (minus any front matter) to an HTML fragment."""
+    from frontmatter import split_front_matter
+    from inline_markdown import markdown_to_html_node
+
+    return markdown_to_html_node(split_front_matter(markdown)[1]).to_html()
+
+
+def render_many(documents):
+    """
+    Lazily renders an iterable of markdown strings, yielding one HTML
+    fragment per document. Modules and compiled patterns are loaded once,
+    and rendered blocks are cached so blocks shared between documents
+    (boilerplate, repeated sections) are converted only once. Front
+    matter is dropped, as in render_markdown.
+    """
+    from frontmatter import split_front_matter
+    from inline_markdown import BlockCache, markdown_to_html_node
+
+    cache = BlockCache()
+    for markdown in documents:
+        yield markdown_to_html_node(split_front_matter(markdown)[1], cache=cache).to_html()
+
+
+def default_config(project_root=None):
+    """Build configuration for a project directory (default: this repo)."""
+    import main
+
+    if project_root is None:
+        return main.default_config()
+    return main.default_config(project_root)
+
+
+def build_site(config):
+    """Builds a site from a config dict; see default_config for the keys."""
+    import main
+
+    return main.build_site(config)
+
+
+def build_in_memory(config, store=None):
+    """
+    Builds a site into memory and returns the output.MemoryOutput holding
+    it, with no writes to disk. Passing the store of an earlier build
+    (its .files) rebuilds only what changed.
+    """
+    import main
+    from output import MemoryOutput
+
+    output = MemoryOutput(store)
+    main.build_site(dict(config, output=output))
+    return output
@@ -0,0 +1,140 @@
+import os
+import re
+import hashlib
+
+from urls import get_resolver
+
+_PLACEHOLDER_RE = re.compile(r"\{\{ (Title|Content) \}\}")
+_URL_ATTR_RE = re.compile(r'\b(href|src)="([^"]*)"')
+_INCLUDE_RE = re.compile(r"\{\{> ([\w./-]+) \}\}")
+
+
+class Template:
+    """
+    A page template split once into literal segments and placeholders,
+    so pages can be streamed without copying the whole document.
+    href/src values in the template text go through resolve_url (see
+    urls.UrlResolver) once, at compile time; urls lists them as written.
+    includes lists the partial files that were inlined into text (see
+    load_template).
+    """
+
+    def __init__(self, text, resolve_url=None, includes=()):
+        self.includes = list(includes)
+        self.urls = [match.group(2) for match in _URL_ATTR_RE.finditer(text)]
+        if resolve_url is not None:
+            text = _URL_ATTR_RE.sub(lambda m: f'{m.group(1)}="{resolve_url(m.group(2))}"', text)
+        self.segments = []
+        last = 0
+        for match in _PLACEHOLDER_RE.finditer(text):
+            if match.start() > last:
+                self.segments.append((None, text[last:match.start()]))
+            self.segments.append((match.group(1), None))
+            last = match.end()
+        if last < len(text):
+            self.segments.append((None, text[last:]))
+        self.content_slots = sum(1 for placeholder, _ in self.segments if placeholder == 'Content')
+
+    def render(self, title, content_chunks):
+        """
+        Yields the page in chunks. content_chunks is an iterable of HTML
+        strings (e.g. from HTMLNode.iter_html); it is only materialized if
+        the template has more than one {{ Content }} placeholder.
+        """
+        if self.content_slots > 1:
+            content_chunks = list(content_chunks)
+        for placeholder, literal in self.segments:
+            if placeholder is None:
+                yield literal
+            elif placeholder == 'Title':
+                yield title
+            else:
+                yield from content_chunks
+
+
+# partial text with its own includes expanded, keyed by path and shared by
+# every template (and every thread) that includes it
+_partial_cache = {}
+
+
+def _expand_includes(text, directory, stack):
+    """
+    Replaces each {{> name }} in text with the named file, relative to
+    directory, recursively. Returns (text, included paths).
+    """
+    includes = []
+
+    def include(match):
+        path = os.path.normpath(os.path.join(directory, match.group(1)))
+        if path in stack:
+            raise ValueError(f"template include cycle: {' -> '.join(stack + [path])}")
+        expanded, nested = _load_partial(path, stack + [path])
+        includes.append(path)
+        includes.extend(nested)
+        return expanded
+
+    return _INCLUDE_RE.sub(include, text), includes
+
+
+def _load_partial(path, stack):
+    mtime = os.stat(path).st_mtime_ns
+    cached = _partial_cache.get(path)
+    if cached is None or cached[0] != mtime or not _is_fresh(cached[2]):
+        with open(path, 'r', encoding='utf-8') as f:
+            text, includes = _expand_includes(f.read(), os.path.dirname(path), stack)
+        cached = (mtime, text, [(p, os.stat(p).st_mtime_ns) for p in dict.fromkeys(includes)])
+        _partial_cache[path] = cached
+    return cached[1], [p for p, _ in cached[2]]
+
+
+def _is_fresh(stamps):
+    try:
+        return all(os.stat(path).st_mtime_ns == mtime for path, mtime in stamps)
+    except FileNotFoundError:
+        return False
+
+
+# compiled templates keyed by (path, basepath), revalidated by the mtimes of
+# the template and its includes so long-running processes (the render
+# daemon) pick up edits
+_template_cache = {}
+
+
+def load_template(template_path, basepath='/', assets=None):
+    """
+    Compiles a template file, inlining {{> name }} partials (paths relative
+    to the including file) once; the result is cached for every page.
+    assets, an optional assets.AssetMap, fingerprints static URLs.
+    """
+    mtime = os.stat(template_path).st_mtime_ns
+    key = (template_path, basepath, assets.key if assets is not None else None)
+    cached = _template_cache.get(key)
+    if cached is not None and cached[0] == mtime and _is_fresh(cached[2]):
+        return cached[1]
+    with open(template_path, 'r', encoding='utf-8') as f:
+        text, includes = _expand_includes(f.read(), os.path.dirname(template_path), [template_path])
+    stamps = [(path, os.stat(path).st_mtime_ns) for path in dict.fromkeys(includes)]
+    template = Template(text, get_resolver(basepath, assets), [path for path, _ in stamps])
+    _template_cache[key] = (mtime, template, stamps)
+    return template
+
+
+def write_chunks(dest_path, chunks):
+    """
+    Streams chunks to dest_path and returns the sha256 of what was written.
+    """
+    # ensure dest directory exists
+    os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+    with open(dest_path, 'w', encoding='utf-8') as f:
+        return stream_chunks(f, chunks)
+
+def stream_chunks(f, chunks):
+    """
+    Writes chunks to the text file f and returns the sha256 of what was
+    written.
+    """
+    digest = hashlib.sha256()
+    for chunk in chunks:
+        f.write(chunk)
+        digest.update(chunk.encode('utf-8'))
+    return digest.hexdigest()
@@ -0,0 +1,84 @@
+import os
+import json
+import unittest
+
+from assets import AssetMap, fingerprint_static, fingerprinted_name
+from depgraph import file_digest
+from urls import UrlResolver
+from main import block_cache
+from sitetest import SiteTestCase
+
+
+class TestAssets(SiteTestCase):
+    def test_fingerprint_static(self):
+        css = self.write("static/index.css", "body {}")
+        png = self.write("static/a.png", "png")
+        files = [(css, "index.css"), (png, os.path.join("images", "a.png"))]
+        assets = fingerprint_static(files, file_digest)
+        self.assertEqual(assets.name("index.css"), fingerprinted_name("index.css", file_digest(css)[:10]))
+        self.assertRegex(assets.url("/images/a.png"), r"^/images/a\.[0-9a-f]{10}\.png$")
+        self.assertEqual(assets.url("/other.css"), "/other.css")
+        # processing the file differently gives it a different name
+        minified = fingerprint_static(files, file_digest, lambda rel: {"minify": True} if rel.endswith(".css") else {})
+        self.assertNotEqual(minified.name("index.css"), assets.name("index.css"))
+        self.assertEqual(minified.name(files[1][1]), assets.name(files[1][1]))
+        self.assertNotEqual(minified.key, assets.key)
+
+    def test_resolver(self):
+        assets = AssetMap({"index.css": "index.abc.css"})
+        resolver = UrlResolver("/repo/", assets)
+        self.assertEqual(resolver("/index.css?v=1#x"), "/repo/index.abc.css?v=1#x")
+        self.assertEqual(resolver("/blog/"), "/repo/blog/")
+        self.assertEqual(resolver("index.css"), "index.css")
+        # rendered blocks are shared; BlockCache checks their asset URLs itself
+        self.assertEqual(resolver.cache_key, UrlResolver("/repo/").cache_key)
+
+    def build(self):
+        return super().build(fingerprint=True)
+
+    def test_build(self):
+        self.write("template.html", '<link href="/index.css">{{ Content }}')
+        self.write("content/index.md", "# Home\n\n![logo](/images/logo.png)")
+        self.write("static/index.css", "body {}")
+        self.write("static/logo.png", "png")
+        self.build()
+        manifest = json.loads(self.read("asset-manifest.json"))
+        self.assertEqual(sorted(manifest), ["images/logo.png", "index.css"])
+        html = self.read("index.html")
+        self.assertIn(f'href="/{manifest["index.css"]}"', html)
+        self.assertIn(f'src="/{manifest["images/logo.png"]}"', html)
+        for hashed in manifest.values():
+            self.assertTrue(os.path.exists(os.path.join(self.out, hashed)))
+        self.assertFalse(os.path.exists(os.path.join(self.out, "index.css")))
+
+        self.assertEqual(self.build().count("Generating page"), 0)
+        # a new stylesheet gets a new name and the pages follow it
+        self.write("static/index.css", "body { color: red }")
+        self.assertEqual(self.build().count("Generating page"), 1)
+        self.assertFalse(os.path.exists(os.path.join(self.out, manifest["index.css"])))
+
+    def test_asset_change_rebuilds_only_pages_using_it(self):
+        self.write("template.html", '<link href="/index.css">{{ Content }}')
+        self.write("content/index.md", "# Home\n\nIntro\n\n![logo](/images/logo.png?v=1)")
+        self.write("content/about.md", "# About\n\nNo images")
+        self.write("static/index.css", "body {}")
+        self.write("static/logo.png", "png")
+        self.build()
+
+        self.write("static/logo.png", "new png")
+        misses = block_cache.misses
+        log = self.build()
+        self.assertEqual(log.count("Generating page"), 1)
+        self.assertNotIn("about.md", log)
+        # only the block showing the image is rendered again
+        self.assertEqual(block_cache.misses - misses, 1)
+        manifest = json.loads(self.read("asset-manifest.json"))
+        self.assertIn(f'src="/{manifest["images/logo.png"]}?v=1"', self.read("index.html"))
+
+        # every page uses the template's stylesheet
+        self.write("static/index.css", "body { color: red }")
+        self.assertEqual(self.build().count("Generating page"), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+import os
+import unittest
+import xml.etree.ElementTree as ET
+from unittest import mock
+
+from blog import page_url, summarize, post_metadata
+from frontmatter import split_front_matter
+from sitetest import SiteTestCase
+
+
+class TestBlogMetadata(unittest.TestCase):
+    def test_front_matter(self):
+        meta, body = split_front_matter("---\ndate: 2024-05-01\nTitle: Hi: there\n---\n# Post\n")
+        self.assertEqual(meta, {"date": "2024-05-01", "title": "Hi: there"})
+        self.assertEqual(body, "# Post\n")
+        self.assertEqual(split_front_matter("# No front matter"), ({}, "# No front matter"))
+
+    def test_page_url(self):
+        self.assertEqual(page_url("index.md"), "/")
+        self.assertEqual(page_url("blog/tom/index.md"), "/blog/tom/")
+        self.assertEqual(page_url("blog/notes.md"), "/blog/notes.html")
+
+    def test_summary_skips_navigation(self):
+        md = "# Tom\n\n[< Back Home](/)\n\n![img](/tom.png)\n\nTom is **odd**, [really](/x)."
+        self.assertEqual(summarize(md), "Tom is odd, really.")
+
+    def test_post_metadata(self):
+        md = "---\ndate: 2024-05-01T10:00\n---\n# Tom\n\nHello"
+        self.assertEqual(
+            post_metadata(md, "/blog/tom/", "2020-01-01"),
+            {"title": "Tom", "date": "2024-05-01", "url": "/blog/tom/", "summary": "Hello"},
+        )
+
+
+class TestBlogBuild(SiteTestCase):
+    def setUp(self):
+        super().setUp()
+        self.write("template.html", "<title>{{ Title }}</title>{{ Content }}")
+        self.write("content/index.md", "# Home")
+        for i in range(1, 26):
+            self.add_post(i)
+
+    def add_post(self, i):
+        self.write(f"content/blog/post{i:03}/index.md", f"---\ndate: 2024-01-{i:02}\n---\n# Post {i}\n\nBody {i}")
+
+    def build(self):
+        return super().build(site_url="https://example.com/", basepath="/site/")
+
+    def test_listings_sitemap_and_feed(self):
+        self.build()
+        front = self.read("blog/index.html")
+        self.assertIn('<a href="/site/blog/post025/">Post 25</a>', front)
+        self.assertNotIn("Post 15<", front)
+        self.assertIn('href="/site/blog/page/2/"', front)
+        self.assertIn("Post 1<", self.read("blog/page/1/index.html"))
+        self.assertIn("Post 25<", self.read("blog/page/3/index.html"))
+
+        sitemap = ET.fromstring(self.read("sitemap.xml"))
+        locs = [el.text for el in sitemap.iter("{http://www.sitemaps.org/schemas/sitemap/0.9}loc")]
+        self.assertIn("https://example.com/site/blog/post003/", locs)
+        self.assertIn("https://example.com/site/", locs)
+
+        feed = ET.fromstring(self.read("feed.xml"))
+        entries = feed.findall("{http://www.w3.org/2005/Atom}entry")
+        self.assertEqual(len(entries), 20)
+        self.assertEqual(entries[0].find("{http://www.w3.org/2005/Atom}title").text, "Post 25")
+
+    def test_adding_a_post_is_incremental(self):
+        self.build()
+        self.add_post(26)
+        log = self.build()
+        self.assertIn("1 re-read", log)
+        self.assertEqual(log.count("Generating page"), 1)
+        written = sorted(line.split()[1] for line in log.splitlines() if line.startswith("Writing "))
+        self.assertEqual(written, ["blog/index.html", "blog/page/3/index.html", "feed.xml", "sitemap.xml"])
+
+    def test_minified_listings(self):
+        self.write("template.html", "<html>\n  <body>\n    {{ Content }}\n  </body>\n</html>")
+        self.build()
+        self.assertIn("\n  <body>", self.read("blog/index.html"))
+        log = super().build(site_url="https://example.com/", basepath="/site/", minify=True)
+        self.assertIn("Writing blog/index.html", log)
+        self.assertTrue(self.read("blog/index.html").startswith("<html><body><div><h1>"))
+
+    def test_template_edit_leaves_xml_alone(self):
+        self.build()
+        self.write("template.html", "<main>{{ Content }}</main>")
+        log = self.build()
+        self.assertIn("Writing blog/index.html", log)
+        self.assertNotIn("Writing sitemap.xml", log)
+        self.assertNotIn("Writing feed.xml", log)
+
+    def test_undated_posts(self):
+        self.write("content/blog/café/index.md", "# Café\n\nNo date")
+        self.build()
+        self.assertNotIn("café/</loc><lastmod>", self.read("sitemap.xml"))
+        # touching a post without editing it doesn't re-read it
+        os.utime(os.path.join(self.root, "content", "blog", "post001", "index.md"), ns=(1, 1))
+        self.assertIn("0 re-read", self.build())
+
+        # in a checkout, undated posts carry the date of the commit adding them
+        self.git("init", "-q")
+        with mock.patch.dict(os.environ, GIT_COMMITTER_DATE="2020-03-04T12:00:00+00:00"):
+            self.commit("posts")
+        self.build()
+        self.assertIn("café/</loc><lastmod>2020-03-04</lastmod>", self.read("sitemap.xml"))
+        # which a later edit doesn't change
+        self.write("content/blog/café/index.md", "# Café\n\nNo date, fixed typo")
+        with mock.patch.dict(os.environ, GIT_COMMITTER_DATE="2024-06-01T12:00:00+00:00"):
+            self.commit("typo")
+        self.assertIn("1 re-read", self.build())
+        self.assertIn("café/</loc><lastmod>2020-03-04</lastmod>", self.read("sitemap.xml"))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from changes import detect_changes
+from depgraph import DependencyGraph
+from search_index import read_page
+from sitetest import SiteTestCase
+
+
+class TestChanges(SiteTestCase):
+    def setUp(self):
+        super().setUp()
+        self.content = os.path.join(self.root, "content")
+        self.git("init", "-q")
+        self.write("content/index.md", "# Home")
+        self.write("content/a.md", "# A")
+        self.write("template.html", "{{ Content }}")
+        self.head = self.commit("initial")
+
+    def test_changed_since_commit(self):
+        self.assertEqual(detect_changes(self.root, None, [self.content]), (None, self.head))
+        path = self.write("content/a.md", "# A edited")
+        head = self.commit("edit")
+        changed, commit = detect_changes(self.root, self.head, [self.content])
+        # git reports real paths
+        self.assertEqual(changed, {os.path.realpath(path)})
+        self.assertEqual(commit, head)
+
+    def test_non_ascii_path(self):
+        path = self.write("content/café.md", "# Café")
+        head = self.commit("add")
+        self.write("content/café.md", "# Café edited")
+        self.commit("edit")
+        changed, _ = detect_changes(self.root, head, [self.content])
+        self.assertEqual(changed, {os.path.realpath(path)})
+
+    def test_fallbacks(self):
+        # unknown history (e.g. a shallow clone)
+        self.assertEqual(detect_changes(self.root, "0" * 40, [self.content]), (None, self.head))
+        # uncommitted or untracked inputs
+        self.write("content/b.md", "# B")
+        self.assertEqual(detect_changes(self.root, self.head, [self.content]), (None, None))
+        # changes outside the inputs don't matter
+        self.assertEqual(detect_changes(self.root, self.head, [os.path.join(self.root, "template.html")]),
+                         (set(), self.head))
+        # not a git checkout
+        with tempfile.TemporaryDirectory() as other:
+            self.assertEqual(detect_changes(other, None, [other]), (None, None))
+
+    def test_trusted_digests_are_not_read(self):
+        src = os.path.join(self.content, "a.md")
+        graph = DependencyGraph(self.root, self.root, {"a.html": {"inputs": {"content/a.md": "recorded"}}})
+        graph.trust_unchanged(set())
+        self.assertEqual(graph.digest(src), "recorded")
+        graph = DependencyGraph(self.root, self.root, {"a.html": {"inputs": {"content/a.md": "recorded"}}})
+        graph.trust_unchanged({src})
+        self.assertNotEqual(graph.digest(src), "recorded")
+
+    def test_incremental_build(self):
+        self.write(".gitignore", "docs/\n")
+        self.commit("ignore output")
+        log = self.build(search=True)
+        self.assertIn("hashing all inputs", log)
+        self.assertEqual(log.count("Generating page"), 2)
+
+        self.write("content/a.md", "# A edited")
+        self.commit("edit")
+        with mock.patch("search_index.read_page", wraps=read_page) as read:
+            log = self.build(search=True)
+        self.assertIn("1 input(s) changed", log)
+        self.assertEqual(log.count("Generating page"), 1)
+        # the search index reads only the changed source
+        self.assertEqual(read.call_args_list, [mock.call(os.path.join(self.content, "a.md"))])
+
+        # a dirty tree is hashed and no commit is recorded for it
+        self.write("content/index.md", "# Home edited")
+        log = self.build()
+        self.assertIn("hashing all inputs", log)
+        self.assertEqual(log.count("Generating page"), 1)
+        self.assertIsNone(DependencyGraph.load(self.root, self.out).commit)
+
+    def test_symlinked_root(self):
+        self.write(".gitignore", "docs/\n")
+        self.commit("ignore output")
+        with tempfile.TemporaryDirectory() as other:
+            # build through a symlink to the checkout
+            link = os.path.join(other, "site")
+            os.symlink(self.root, link)
+            self.root = link
+            self.build()
+            self.write("content/a.md", "# A edited")
+            self.commit("edit")
+            log = self.build()
+            self.assertIn("1 input(s) changed", log)
+            self.assertEqual(log.count("Generating page"), 1)
+            self.assertIn("A edited", self.read("a.html"))
+
+
+if __name__ == "__main__":
+    unittest.main()
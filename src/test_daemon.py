@@ -0,0 +1,86 @@
+import os
+import socket
+import tempfile
+import threading
+import unittest
+
+from daemon import RenderDaemon, request
+
+
+@unittest.skipUnless(hasattr(socket, "AF_UNIX"), "requires Unix sockets")
+class TestRenderDaemon(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.socket_path = os.path.join(self.tmp.name, "ssg.sock")
+        self.template_path = os.path.join(self.tmp.name, "template.html")
+        with open(self.template_path, "w") as f:
+            f.write('<title>{{ Title }}</title><a href="/">home</a>{{ Content }}')
+        self.server = RenderDaemon(self.socket_path, self.template_path)
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.thread.join()
+        self.server.server_close()
+        self.tmp.cleanup()
+
+    def test_render_fragment(self):
+        response = request({"op": "render", "markdown": "# Hi\n\nsome **bold**"}, self.socket_path)
+        self.assertTrue(response["ok"])
+        self.assertEqual(response["html"], "<div><h1>Hi</h1><p>some <b>bold</b></p></div>")
+        self.assertEqual(response["title"], "Hi")
+        self.assertIn("ms", response)
+
+    def test_render_fragment_without_title(self):
+        for markdown, html in (("just a paragraph", "<div><p>just a paragraph</p></div>"),
+                               ("## sub\n\ntext", "<div><h2>sub</h2><p>text</p></div>")):
+            response = request({"op": "render", "markdown": markdown}, self.socket_path)
+            self.assertEqual((response["html"], response["title"]), (html, None))
+
+    def test_render_fragment_basepath(self):
+        payload = {"op": "render", "markdown": "# Hi\n\n[home](/)", "basepath": "/repo/"}
+        self.assertEqual(request(payload, self.socket_path)["html"],
+                         '<div><h1>Hi</h1><p><a href="/repo/">home</a></p></div>')
+        hits = request({"op": "stats"}, self.socket_path)["block_cache"]["hits"]
+        request(payload, self.socket_path)
+        self.assertEqual(request({"op": "stats"}, self.socket_path)["block_cache"]["hits"], hits + 2)
+
+    def test_running_daemon_is_not_replaced(self):
+        with self.assertRaises(OSError):
+            RenderDaemon(self.socket_path, self.template_path)
+        self.assertTrue(request({"op": "stats"}, self.socket_path)["ok"])
+        # a socket file nobody listens on is replaced
+        stale = os.path.join(self.tmp.name, "stale.sock")
+        with open(stale, "w"):
+            pass
+        RenderDaemon(stale, self.template_path).server_close()
+        self.assertFalse(os.path.exists(stale))
+
+    def test_render_fragment_drops_front_matter(self):
+        response = request({"op": "render", "markdown": "---\nlayout: post\n---\n# Hi"}, self.socket_path)
+        self.assertEqual(response["html"], "<div><h1>Hi</h1></div>")
+        self.assertEqual(response["title"], "Hi")
+
+    def test_render_page(self):
+        response = request(
+            {"op": "render", "markdown": "# Hi", "template": True, "basepath": "/repo/"},
+            self.socket_path,
+        )
+        self.assertEqual(
+            response["html"],
+            '<title>Hi</title><a href="/repo/">home</a><div><h1>Hi</h1></div>',
+        )
+
+    def test_errors_and_stats(self):
+        response = request({"op": "render", "markdown": "no **end"}, self.socket_path)
+        self.assertFalse(response["ok"])
+        self.assertIn("formatted section not closed", response["error"])
+        request({"op": "nope"}, self.socket_path)
+        stats = request({"op": "stats"}, self.socket_path)
+        self.assertEqual(stats["errors"], 2)
+        self.assertEqual(stats["ops"]["render"]["count"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
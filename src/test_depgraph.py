@@ -0,0 +1,59 @@
+import os
+import unittest
+
+from depgraph import DependencyGraph
+from sitetest import SiteTestCase
+
+
+class TestDependencyGraph(SiteTestCase):
+    def setUp(self):
+        super().setUp()
+        os.makedirs(self.out)
+
+    def test_staleness(self):
+        src = self.write("content/index.md", "# Home")
+        tpl = self.write("template.html", "{{ Content }}")
+        self.write("docs/index.html", "<h1>Home</h1>")
+        graph = DependencyGraph(self.root, self.out)
+        self.assertTrue(graph.is_stale("index.html", [src, tpl], {"basepath": "/"}))
+        graph.record("index.html", [src, tpl], {"basepath": "/"})
+        graph.save()
+
+        graph = DependencyGraph.load(self.root, self.out)
+        self.assertFalse(graph.is_stale("index.html", [src, tpl], {"basepath": "/"}))
+        self.assertTrue(graph.is_stale("index.html", [src, tpl], {"basepath": "/repo/"}))
+        self.write("template.html", "<main>{{ Content }}</main>")
+        graph = DependencyGraph.load(self.root, self.out)
+        self.assertTrue(graph.is_stale("index.html", [src, tpl], {"basepath": "/"}))
+
+    def test_incremental_build(self):
+        self.write("content/index.md", "# Home")
+        self.write("content/blog/a/index.md", "# A")
+        self.write("content/blog/b/index.md", "# B")
+        self.write("static/index.css", "body {}")
+        self.write("template.html", "{{ Content }}")
+        self.write("docs/CNAME", "example.com")
+
+        log = self.build()
+        self.assertEqual(log.count("Generating page"), 3)
+        self.assertEqual(self.build().count("Generating page"), 0)
+
+        self.write("content/blog/a/index.md", "# A edited")
+        log = self.build()
+        self.assertEqual(log.count("Generating page"), 1)
+        self.assertNotIn("Copying /", log)
+
+        os.remove(os.path.join(self.root, "content", "blog", "b", "index.md"))
+        log = self.build()
+        self.assertEqual(log.count("Generating page"), 0)
+        self.assertFalse(os.path.exists(os.path.join(self.out, "blog", "b")))
+        self.assertTrue(os.path.exists(os.path.join(self.out, "blog", "a", "index.html")))
+        # files the build never produced are left alone
+        self.assertTrue(os.path.exists(os.path.join(self.out, "CNAME")))
+
+        self.write("template.html", "<main>{{ Content }}</main>")
+        self.assertEqual(self.build().count("Generating page"), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
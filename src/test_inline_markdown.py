@@ -8,7 +8,9 @@ from inline_markdown import (
     markdown_to_blocks,
     markdown_to_html_node,
     extract_title,
+    BlockCache,
 )
+from urls import UrlResolver
 
 from textnode import TextNode, TextType
 
@@ -343,6 +345,78 @@ the **same** even with inline stuff
         with self.assertRaises(ValueError):
             extract_title(md)
 
+class TestBlockCache(unittest.TestCase):
+    def test_cached_render_matches(self):
+        md = "# Title\n\nSome **bold** text\n\n- a\n- b\n\n```\ncode\n```"
+        cache = BlockCache()
+        expected = markdown_to_html_node(md).to_html()
+        self.assertEqual(markdown_to_html_node(md, cache=cache).to_html(), expected)
+        self.assertEqual(markdown_to_html_node(md, cache=cache).to_html(), expected)
+        self.assertEqual((cache.hits, cache.misses), (4, 4))
+
+    def test_edit_rerenders_changed_block_only(self):
+        blocks = [f"Paragraph number {i}" for i in range(50)]
+        cache = BlockCache()
+        markdown_to_html_node("\n\n".join(blocks), cache=cache)
+        blocks[10] = "Paragraph number 10, _edited_"
+        html = markdown_to_html_node("\n\n".join(blocks), cache=cache).to_html()
+        self.assertEqual(cache.misses, 51)
+        self.assertIn("<p>Paragraph number 10, <i>edited</i></p>", html)
+
+    def test_resolver_is_part_of_key(self):
+        cache = BlockCache()
+        md = "[home](/)"
+        a = markdown_to_html_node(md, UrlResolver("/a/"), cache).to_html()
+        b = markdown_to_html_node(md, UrlResolver("/b/"), cache).to_html()
+        self.assertEqual(a, '<div><p><a href="/a/">home</a></p></div>')
+        self.assertEqual(b, '<div><p><a href="/b/">home</a></p></div>')
+
+    def test_eviction(self):
+        cache = BlockCache(max_entries=2)
+        markdown_to_html_node("a\n\nb\n\nc", cache=cache)
+        self.assertEqual(len(cache.entries), 2)
+
+
+class TestExtendedSyntax(unittest.TestCase):
+    def test_strikethrough(self):
+        self.assertEqual(markdown_to_html_node("a ~~gone~~ b").to_html(), "<div><p>a <del>gone</del> b</p></div>")
+        with self.assertRaises(ValueError):
+            text_to_textnodes("a ~~never closed")
+
+    def test_code_spans_are_literal(self):
+        self.assertListEqual(text_to_textnodes("`snake_case` and `**`"), [
+            TextNode("snake_case", TextType.CODE),
+            TextNode(" and ", TextType.TEXT),
+            TextNode("**", TextType.CODE),
+        ])
+
+    def test_unclosed_delimiter(self):
+        with self.assertRaises(ValueError):
+            text_to_textnodes("this is **not closed")
+
+    def test_table(self):
+        md = "| Name | Qty |\n|:-----|----:|\n| **a** | 1 |\n| b \\| c |"
+        self.assertEqual(block_to_block_type(md), BlockType.TABLE)
+        self.assertEqual(
+            markdown_to_html_node(md).to_html(),
+            '<div><table><thead><tr><th style="text-align: left">Name</th>'
+            '<th style="text-align: right">Qty</th></tr></thead><tbody>'
+            '<tr><td style="text-align: left"><b>a</b></td><td style="text-align: right">1</td></tr>'
+            '<tr><td style="text-align: left">b | c</td><td style="text-align: right"></td></tr>'
+            "</tbody></table></div>",
+        )
+        self.assertEqual(block_to_block_type("| not\n| a table"), BlockType.PARAGRAPH)
+
+    def test_footnotes(self):
+        html = markdown_to_html_node("Claim[^1].\n\n[^1]: Source with [a link](/x).").to_html()
+        self.assertEqual(
+            html,
+            '<div><p>Claim<sup><a href="#fn-1" id="fnref-1">1</a></sup>.</p>'
+            '<div class="footnote" id="fn-1"><sup>1</sup> Source with <a href="/x">a link</a>.'
+            ' <a href="#fnref-1">↩</a></div></div>',
+        )
+
+
 class TestBlockToBlockType(unittest.TestCase):
     def test_heading_blocks(self):
         self.assertEqual(block_to_block_type("# Heading"), BlockType.HEADING)
@@ -394,7 +468,7 @@ print('bye')
         # Looks like ordered but numbering is wrong
         self.assertEqual(block_to_block_type("1. one\n3. three"), BlockType.PARAGRAPH)
 
-from inline_markdown import block_to_block_type, BlockType
+from inline_markdown import block_to_block_type, BlockType, text_to_textnodes
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,59 @@
+import os
+import unittest
+from unittest import mock
+
+from layouts import LayoutResolver
+from sitetest import SiteTestCase
+
+
+class TestLayouts(SiteTestCase):
+    def setUp(self):
+        super().setUp()
+        self.content = os.path.join(self.root, "content")
+
+    def test_resolution(self):
+        default = self.write("template.html", "")
+        blog = self.write("content/blog/_layout.html", "")
+        post = self.write("layouts/post.html", "")
+        resolver = LayoutResolver(self.content, default, os.path.join(self.root, "layouts"))
+        self.assertEqual(resolver.resolve(os.path.join(self.content, "index.md")), default)
+        self.assertEqual(resolver.resolve(os.path.join(self.content, "blog", "2024", "a", "index.md")), blog)
+        self.assertEqual(resolver.resolve(os.path.join(self.content, "about.md"), {"layout": "post"}), post)
+        with self.assertRaises(ValueError):
+            resolver.resolve(os.path.join(self.content, "about.md"), {"layout": "missing"})
+
+    def test_directories_are_probed_once(self):
+        default = self.write("template.html", "")
+        resolver = LayoutResolver(self.content, default)
+        with mock.patch("os.path.isfile", wraps=os.path.isfile) as isfile:
+            for name in ("a.md", "b.md", "c.md"):
+                resolver.resolve(os.path.join(self.content, "blog", "x", name))
+            resolver.resolve(os.path.join(self.content, "blog", "y.md"))
+        # content/blog/x, content/blog and content
+        self.assertEqual(isfile.call_count, 3)
+
+    def test_build(self):
+        self.write("template.html", "site:{{ Content }}")
+        self.write("content/index.md", "# Home")
+        self.write("content/blog/_layout.html", "{{> ../../partials/head.html }}blog:{{ Content }}")
+        self.write("partials/head.html", "<head>")
+        self.write("content/blog/a/index.md", "# A")
+        self.write("content/about.md", "---\nlayout: wide\n---\n# About")
+        self.write("layouts/wide.html", "wide:{{ Content }}")
+        self.assertEqual(self.build().count("Generating page"), 3)
+        self.assertTrue(self.read("index.html").startswith("site:"))
+        self.assertTrue(self.read("blog/a/index.html").startswith("<head>blog:"))
+        self.assertTrue(self.read("blog/index.html").startswith("<head>blog:"))
+        self.assertTrue(self.read("about.html").startswith("wide:"))
+
+        # a partial is an input of every page using it
+        head = self.write("partials/head.html", "<head lang=en>")
+        os.utime(head, ns=(1, 1))
+        log = self.build()
+        self.assertEqual(log.count("Generating page"), 1)
+        self.assertIn("Writing blog/index.html", log)
+        self.assertTrue(self.read("blog/a/index.html").startswith("<head lang=en>blog:"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+import unittest
+from contextlib import redirect_stdout, redirect_stderr
+from io import StringIO
+from unittest import mock
+
+from linkcheck import LinkChecker, BrokenLinks, output_urls
+from inline_markdown import BlockCache, markdown_to_html_node
+from main import main
+from sitetest import SiteTestCase
+
+
+class TestLinkChecker(unittest.TestCase):
+    def test_output_urls(self):
+        self.assertEqual(output_urls("index.html"), ["/index.html", "/"])
+        self.assertEqual(output_urls("blog/tom/index.html"), ["/blog/tom/index.html", "/blog/tom/", "/blog/tom"])
+        self.assertEqual(output_urls("notes.html"), ["/notes.html", "/notes"])
+        self.assertEqual(output_urls("images/tom.png"), ["/images/tom.png"])
+
+    def test_is_valid(self):
+        checker = LinkChecker(["index.html", "blog/tom/index.html", "images/tom.png"])
+        for url in ("/", "/blog/tom", "/blog/tom/#intro", "/images/tom.png?v=1",
+                    "https://boot.dev", "//cdn.example.com/x", "relative/page", "#top"):
+            self.assertTrue(checker.is_valid(url), url)
+        for url in ("/blog/tomm", "/images/missing.png", "/blog/"):
+            self.assertFalse(checker.is_valid(url), url)
+
+    def test_links_collected_with_lines(self):
+        md = "# Title\n\nsee [a](/a) and\n[b](/b)\n\n- ![img](/i.png)"
+        found = []
+        markdown_to_html_node(md, on_link=lambda url, line: found.append((url, line)))
+        self.assertEqual(found, [("/a", 3), ("/b", 4), ("/i.png", 6)])
+
+    def test_cached_blocks_replay_links(self):
+        cache = BlockCache()
+        md = "[a](/a)\n\n[b](/b)"
+        markdown_to_html_node(md, cache=cache)
+        found = []
+        markdown_to_html_node(md, cache=cache, on_link=lambda url, line: found.append((url, line)))
+        self.assertEqual(cache.hits, 2)
+        self.assertEqual(found, [("/a", 1), ("/b", 3)])
+
+
+class TestLinkCheckBuild(SiteTestCase):
+    def setUp(self):
+        super().setUp()
+        self.write("template.html", '<link href="/index.css">{{ Content }}')
+        self.write("static/index.css", "body {}")
+        self.write("content/index.md", "# Home\n\n[ok](/about) [css](/index.css)\n\n[broken](/missing)")
+        self.write("content/about/index.md", "---\ndate: 2024-01-01\n---\n# About\n\n![x](/images/x.png)")
+
+    def build(self, mode="warn", **overrides):
+        log = super().build(check_links=mode, **overrides)
+        return [line for line in log.splitlines() if line.startswith("Warning:")]
+
+    def test_warns_with_source_and_line(self):
+        expected = [
+            "Warning: content/about/index.md:6: broken link /images/x.png",
+            "Warning: content/index.md:5: broken link /missing",
+        ]
+        self.assertEqual(self.build(), expected)
+        # unchanged pages are checked from the recorded links
+        self.assertEqual(self.build(), expected)
+
+    def test_error_mode(self):
+        with self.assertRaises(BrokenLinks):
+            self.build("error")
+
+    def test_error_mode_exit_status(self):
+        config = self.config()
+        with mock.patch("main.default_config", return_value=config), redirect_stdout(StringIO()) as log, \
+                redirect_stderr(StringIO()) as err:
+            self.assertEqual(main(["--check-links", "error"]), 1)
+        self.assertIn("Error: content/index.md:5: broken link /missing", log.getvalue())
+        self.assertEqual(err.getvalue(), "Error: 2 broken internal link(s)\n")
+        self.write("content/index.md", "# Home")
+        self.write("static/images/x.png", "png")
+        self.assertEqual(self.build("error"), [])
+
+    def test_blog_archive_pages_exist(self):
+        for n in range(3):
+            self.write(f"content/blog/post{n}.md", f"---\ndate: 2024-01-0{n + 1}\n---\n# Post {n}")
+        self.write("content/index.md", "# Home\n\n[blog](/blog/) [older](/blog/page/2/)\n\n[gone](/blog/page/3/)")
+        self.assertEqual(self.build(blog_page_size=2), [
+            "Warning: content/about/index.md:6: broken link /images/x.png",
+            "Warning: content/index.md:5: broken link /blog/page/3/",
+        ])
+        self.assertEqual(self.read("blog/page/2/index.html").count("<li>"), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+import unittest
+
+from minify import HTMLMinifier, minify_html, minify_html_chunks, minify_css, minify_css_cached
+
+
+class TestMinifyHTML(unittest.TestCase):
+    def test_collapses_template_whitespace(self):
+        html = '<html>\n  <head>\n    <title>Hi</title>\n  </head>\n  <body>\n    <p>a   b\n c</p>\n  </body>\n</html>\n'
+        self.assertEqual(minify_html(html), "<html><head><title>Hi</title></head><body><p>a b c</p></body></html>")
+
+    def test_keeps_inline_spaces(self):
+        self.assertEqual(minify_html("<p><b>a</b> <i>b</i></p>"), "<p><b>a</b> <i>b</i></p>")
+        # a line break between inline elements still renders as a space
+        self.assertEqual(minify_html("<b>x</b>\n<i>y</i>"), "<b>x</b> <i>y</i>")
+        nav = '<nav>\n  <a href="/">Home</a>\n  <a href="/blog/">Blog</a>\n</nav>'
+        self.assertEqual(minify_html(nav), '<nav><a href="/">Home</a> <a href="/blog/">Blog</a></nav>')
+        self.assertEqual(minify_html("<p>a\n  <!-- c -->\n  <b>b</b></p>"), "<p>a <b>b</b></p>")
+
+    def test_preserves_pre_and_code(self):
+        html = "<pre><code>def f():\n    return  1\n</code></pre>\n  <p>x  y</p>"
+        self.assertEqual(minify_html(html), "<pre><code>def f():\n    return  1\n</code></pre><p>x y</p>")
+        self.assertEqual(minify_html("<p>a <code>x  =  1</code>  b</p>"), "<p>a <code>x  =  1</code> b</p>")
+
+    def test_removes_comments(self):
+        self.assertEqual(minify_html("<p>a<!-- note --> b</p>"), "<p>a b</p>")
+
+    def test_streaming_matches_whole(self):
+        html = ('<html>\n <body>\n  <p>Some <b>bold</b>  text</p>\n  <pre>  keep  </pre>\n<!-- c -->\n'
+                '  <a href="/">x</a>\n  <a href="/y">y</a>\n </body>\n</html>')
+        whole = minify_html(html)
+        for size in (1, 2, 3, 7):
+            chunks = [html[i:i + size] for i in range(0, len(html), size)]
+            self.assertEqual("".join(minify_html_chunks(chunks)), whole)
+
+    def test_split_tag_is_held_back(self):
+        minifier = HTMLMinifier()
+        self.assertEqual(minifier.feed("<p>a</p><sp"), "<p>a</p>")
+        self.assertEqual(minifier.feed("an>b</span>"), "<span>b</span>")
+
+
+class TestMinifyCSS(unittest.TestCase):
+    def test_minify_css(self):
+        css = "/* header */\nbody {\n  color: red;\n  margin: 0 auto;\n}\n\na:hover, a > b {\n  color: blue;\n}\n"
+        self.assertEqual(minify_css(css), "body{color:red;margin:0 auto}a:hover,a>b{color:blue}")
+
+    def test_strings_and_descendants(self):
+        css = 'a :hover { content: "a  ;  b"; width: calc(1px + 2px) }'
+        self.assertEqual(minify_css(css), 'a :hover{content:"a  ;  b";width:calc(1px + 2px)}')
+
+    def test_cached(self):
+        css = "p { margin: 0; }"
+        self.assertEqual(minify_css_cached(css), "p{margin:0}")
+        self.assertIs(minify_css_cached(css), minify_css_cached(css))
+
+
+if __name__ == "__main__":
+    unittest.main()
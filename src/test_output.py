@@ -0,0 +1,108 @@
+import os
+import tarfile
+import unittest
+import zipfile
+
+from output import ArchiveOutput, DirectoryOutput, MemoryOutput
+from sitetest import SiteTestCase
+
+
+class TestOutput(SiteTestCase):
+    def fill(self, output):
+        src = self.write("src/logo.png", "png")
+        output.write("b/index.html", ["<p>", "b", "</p>"])
+        output.copy("images/logo.png", src)
+        output.write("a.html", ["a"])
+
+    def test_directory(self):
+        out = DirectoryOutput(os.path.join(self.root, "out"))
+        self.fill(out)
+        self.assertEqual(out.read("b/index.html"), "<p>b</p>")
+        self.assertIsNone(out.read("missing.html"))
+        out.remove("b/index.html")
+        self.assertFalse(os.path.exists(os.path.join(self.root, "out", "b")))
+        self.assertTrue(out.exists("a.html"))
+
+    def test_memory(self):
+        store = {}
+        out = MemoryOutput(store)
+        self.fill(out)
+        self.assertEqual(store, {"b/index.html": b"<p>b</p>", "images/logo.png": b"png", "a.html": b"a"})
+        self.assertEqual(out.read(os.path.join("b", "index.html")), "<p>b</p>")
+        self.assertIsNone(out.read("missing.html"))
+        out.remove("a.html")
+        self.assertFalse(out.exists("a.html"))
+
+    def test_tar_is_reproducible(self):
+        paths = []
+        for name in ("one.tar.gz", "two.tar.gz"):
+            path = os.path.join(self.root, name)
+            with ArchiveOutput(path) as out:
+                self.fill(out)
+                self.assertTrue(out.exists("a.html"))
+            paths.append(path)
+        with open(paths[0], "rb") as a, open(paths[1], "rb") as b:
+            self.assertEqual(a.read(), b.read())
+        with tarfile.open(paths[0]) as tar:
+            self.assertEqual(tar.getnames(), ["b/index.html", "images/logo.png", "a.html"])
+            info = tar.getmember("a.html")
+            self.assertEqual((info.mtime, info.mode, info.uid), (315532800, 0o644, 0))
+            self.assertEqual(tar.extractfile("b/index.html").read(), b"<p>b</p>")
+
+    def test_zip(self):
+        path = os.path.join(self.root, "site.zip")
+        with ArchiveOutput(path, mtime=1700000000) as out:
+            self.fill(out)
+            with self.assertRaises(ValueError):
+                out.write("a.html", ["again"])
+        with zipfile.ZipFile(path) as zf:
+            self.assertEqual(zf.namelist(), ["b/index.html", "images/logo.png", "a.html"])
+            self.assertEqual(zf.read("images/logo.png"), b"png")
+            self.assertEqual(zf.getinfo("a.html").date_time, (2023, 11, 14, 22, 13, 20))
+
+    def test_failed_build_leaves_no_archive(self):
+        path = os.path.join(self.root, "site.tar")
+        with self.assertRaises(RuntimeError):
+            with ArchiveOutput(path) as out:
+                self.fill(out)
+                raise RuntimeError("render failed")
+        self.assertEqual(sorted(os.listdir(self.root)), ["src"])
+
+    def test_unknown_suffix(self):
+        with self.assertRaises(ValueError):
+            ArchiveOutput(os.path.join(self.root, "site.rar"))
+
+    def test_build_into_archive(self):
+        self.write("content/index.md", "# Home\n\n[blog](/blog/a)")
+        self.write("content/blog/a/index.md", "# A")
+        self.write("static/index.css", "body {}")
+        self.write("template.html", "{{ Content }}")
+        archive = os.path.join(self.root, "site.tar.xz")
+        self.build(archive=archive, search=True)
+        self.assertFalse(os.path.exists(self.out))
+        with tarfile.open(archive) as tar:
+            names = tar.getnames()
+        self.assertEqual(names[:3], ["index.css", "blog/a/index.html", "index.html"])
+        self.assertIn("feed.xml", names)
+        self.assertIn("search/docs.json", names)
+        # build state stays out of the artifact
+        for state in (".manifest.json", ".blog-index.json", "search/state.json"):
+            self.assertNotIn(state, names)
+
+    def test_archive_build_is_reproducible(self):
+        self.write("content/index.md", "# Home")
+        post = self.write("content/blog/a/index.md", "# A\n\nNo date")
+        self.write("content/blog/b/index.md", "---\ndate: 2024-01-01\n---\n# B")
+        self.write("static/logo.png", "png")
+        self.write("template.html", "{{ Content }}")
+        archives = [os.path.join(self.root, "one.tar.gz"), os.path.join(self.root, "two.tar.gz")]
+        self.build(archive=archives[0], search=True)
+        # a fresh checkout gives the sources new mtimes
+        os.utime(post, ns=(1, 1))
+        self.build(archive=archives[1], search=True)
+        with open(archives[0], "rb") as a, open(archives[1], "rb") as b:
+            self.assertEqual(a.read(), b.read())
+
+
+if __name__ == "__main__":
+    unittest.main()
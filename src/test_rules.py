@@ -0,0 +1,61 @@
+import unittest
+
+from htmlnode import LeafNode, ParentNode
+from rules import BlockRule, InlineRule, RuleRegistry
+from textnode import TextNode, TextType
+
+
+def paragraph(block, children):
+    return ParentNode("p", children(block))
+
+
+class TestRuleRegistry(unittest.TestCase):
+    def setUp(self):
+        self.rules = RuleRegistry(BlockRule("paragraph", "p", None, paragraph))
+        self.rules.add_inline(InlineRule("bold", r"\*\*(.*?)\*\*", lambda t: TextNode(t, TextType.BOLD), "*", "**"))
+        self.rules.add_inline(InlineRule("link", r"\[([^\]]+)\]\(([^\)]+)\)",
+                                         lambda t, url: TextNode(t, TextType.LINK, url), "["))
+
+    def test_single_scan(self):
+        self.assertListEqual(self.rules.tokenize("**a** [b](u) c"), [
+            TextNode("a", TextType.BOLD),
+            TextNode(" ", TextType.TEXT),
+            TextNode("b", TextType.LINK, "u"),
+            TextNode(" c", TextType.TEXT),
+        ])
+        self.assertListEqual(self.rules.tokenize("plain"), [TextNode("plain", TextType.TEXT)])
+        with self.assertRaises(ValueError):
+            self.rules.tokenize("**open")
+
+    def test_priority(self):
+        code = InlineRule("code", r"`(.*?)`", lambda t: TextNode(t, TextType.CODE), "`", "`")
+        self.rules.add_inline(code, before="bold")
+        self.assertEqual([rule.name for rule in self.rules.inline], ["code", "bold", "link"])
+        self.assertListEqual(self.rules.tokenize("`**`"), [TextNode("**", TextType.CODE)])
+        with self.assertRaises(ValueError):
+            self.rules.add_inline(code)
+        with self.assertRaises(ValueError):
+            self.rules.add_inline(InlineRule("x", "x", None, "x"), before="missing")
+
+    def test_block_dispatch(self):
+        calls = []
+
+        def is_rule(block, lines):
+            calls.append(block)
+            return set(block) == {"-"}
+
+        rule = BlockRule("hr", "hr", is_rule, lambda block, children: LeafNode("hr", ""), "-")
+        version = self.rules.version
+        self.rules.add_block(rule)
+        self.assertGreater(self.rules.version, version)
+        self.assertIs(self.rules.block_rule("---"), rule)
+        self.assertEqual(self.rules.block_rule("- item").btype, "p")
+        # blocks starting with other characters never reach the rule
+        self.assertEqual(self.rules.block_rule("text").btype, "p")
+        self.assertEqual(calls, ["---", "- item"])
+        self.assertIs(self.rules.rule_for_type("hr"), rule)
+        self.assertEqual(self.rules.rule_for_type("unknown").btype, "p")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+import os
+import json
+import tempfile
+import unittest
+
+from search_index import (
+    stem,
+    tokenize,
+    markdown_to_plain_text,
+    encode_postings,
+    decode_postings,
+    update_search_index,
+    update_search_index_from_files,
+    lookup,
+)
+
+
+class TestSearchIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.index_dir = os.path.join(self.tmp.name, "search")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_stem(self):
+        self.assertEqual(stem("hobbits"), "hobbit")
+        self.assertEqual(stem("stories"), "story")
+        self.assertEqual(stem("walking"), "walk")
+        self.assertEqual(stem("glass"), "glass")
+        self.assertEqual(stem("is"), "is")
+
+    def test_tokenize(self):
+        self.assertEqual(tokenize("The Hobbits of the Shire"), {"hobbit", "shire"})
+
+    def test_plain_text(self):
+        md = "# Title\n\nSome **bold** and [a link](/x) with ![alt text](/i.png)\n\n- item _one_"
+        text = markdown_to_plain_text(md)
+        self.assertIn("bold", text)
+        self.assertIn("a link", text)
+        self.assertIn("alt text", text)
+        self.assertIn("item one", text.replace("\n", " "))
+        self.assertNotIn("/x", text)
+        self.assertNotIn("**", text)
+
+    def test_postings_roundtrip(self):
+        ids = [0, 3, 4, 10, 250]
+        self.assertEqual(encode_postings(ids), [0, 3, 1, 6, 240])
+        self.assertEqual(decode_postings(encode_postings(ids)), ids)
+
+    def test_build_and_lookup(self):
+        pages = {
+            "/": "# Home\n\nWelcome to Rivendell",
+            "/blog/tom/": "# Tom\n\nTom Bombadil sings in Rivendell",
+        }
+        self.assertEqual(update_search_index(pages, self.index_dir), 2)
+        self.assertEqual(sorted(lookup(self.index_dir, "rivendell")), ["/", "/blog/tom/"])
+        self.assertEqual(lookup(self.index_dir, "singing"), ["/blog/tom/"])
+        self.assertEqual(lookup(self.index_dir, "mordor"), [])
+
+    def test_incremental_update(self):
+        pages = {
+            "/a/": "# A\n\nelves and dwarves",
+            "/b/": "# B\n\nhobbits",
+        }
+        update_search_index(pages, self.index_dir)
+        self.assertEqual(update_search_index(pages, self.index_dir), 0)
+
+        hobbit_shard = os.path.join(self.index_dir, "ho.json")
+        mtime = os.path.getmtime(hobbit_shard)
+        pages["/a/"] = "# A\n\nelves and ents"
+        self.assertEqual(update_search_index(pages, self.index_dir), 1)
+        self.assertEqual(os.path.getmtime(hobbit_shard), mtime)
+        self.assertEqual(lookup(self.index_dir, "dwarves"), [])
+        self.assertEqual(lookup(self.index_dir, "ents"), ["/a/"])
+
+    def test_removed_page(self):
+        pages = {"/a/": "# A\n\nelves", "/b/": "# B\n\nelves"}
+        update_search_index(pages, self.index_dir)
+        del pages["/a/"]
+        self.assertEqual(update_search_index(pages, self.index_dir), 1)
+        self.assertEqual(lookup(self.index_dir, "elves"), ["/b/"])
+        with open(os.path.join(self.index_dir, "docs.json")) as f:
+            docs = json.load(f)
+        self.assertEqual(docs[0], None)
+
+    def test_lost_state_rebuilds_index(self):
+        update_search_index({"/a/": "# A\n\nelves", "/b/": "# B\n\nhobbits"}, self.index_dir)
+        os.remove(os.path.join(self.index_dir, "state.json"))
+        self.assertEqual(update_search_index({"/a/": "# A\n\nelves", "/c/": "# C\n\nents"}, self.index_dir), 2)
+        with open(os.path.join(self.index_dir, "docs.json")) as f:
+            self.assertEqual([doc["url"] for doc in json.load(f)], ["/a/", "/c/"])
+        self.assertEqual(lookup(self.index_dir, "elves"), ["/a/"])
+        self.assertEqual(lookup(self.index_dir, "hobbits"), [])
+        self.assertFalse(os.path.exists(os.path.join(self.index_dir, "ho.json")))
+
+    def test_sources_read_only_when_changed(self):
+        paths = {}
+        for name, text in (("a", "# A\n\nelves"), ("b", "# B\n\nhobbits")):
+            paths[name] = os.path.join(self.tmp.name, f"{name}.md")
+            with open(paths[name], "w") as f:
+                f.write(text)
+        digests = {paths["a"]: "1", paths["b"]: "2"}
+        pages = {"/a/": paths["a"], "/b/": paths["b"]}
+        self.assertEqual(update_search_index_from_files(pages, self.index_dir, digest=digests.get), 2)
+        # an unchanged source is never opened
+        os.remove(paths["b"])
+        with open(paths["a"], "w") as f:
+            f.write("# A\n\nents")
+        digests[paths["a"]] = "3"
+        self.assertEqual(update_search_index_from_files(pages, self.index_dir, digest=digests.get), 1)
+        self.assertEqual(lookup(self.index_dir, "ents"), ["/a/"])
+        self.assertEqual(lookup(self.index_dir, "hobbits"), ["/b/"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+import os
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+
+from shards import parse_shard, select_shard, merge_shards
+from depgraph import DependencyGraph, read_manifest
+from main import merge_site
+from sitetest import SiteTestCase
+
+
+class TestShards(SiteTestCase):
+    def write_manifest(self, out_dir, outputs, shard):
+        graph = DependencyGraph(self.root, out_dir)
+        for output, source in outputs.items():
+            graph.record(output, [self.write(source, source)])
+        graph.save(shard)
+
+    def make_pages(self, n):
+        pages = []
+        for i in range(n):
+            src = self.write(f"content/p{i}/index.md", "x" * (i * 10 + 1))
+            pages.append((src, os.path.join(self.root, f"docs/p{i}/index.html")))
+        return pages
+
+    def test_parse_shard(self):
+        self.assertEqual(parse_shard("2/4"), (2, 4))
+        for bad in ("0/4", "5/4", "1", "a/b", "1/0"):
+            with self.assertRaises(ValueError):
+                parse_shard(bad)
+
+    def test_shards_partition_pages(self):
+        pages = self.make_pages(20)
+        content = os.path.join(self.root, "content")
+        for strategy in ("hash", "cost"):
+            seen = []
+            for i in range(1, 4):
+                seen.extend(select_shard(pages, i, 3, content, strategy))
+            self.assertEqual(sorted(seen), sorted(pages))
+            # deterministic
+            self.assertEqual(sorted(select_shard(pages, 2, 3, content, strategy)),
+                             sorted(select_shard(list(reversed(pages)), 2, 3, content, strategy)))
+
+    def test_cost_strategy_balances(self):
+        pages = self.make_pages(12)
+        content = os.path.join(self.root, "content")
+        loads = [sum(os.path.getsize(src) for src, _ in select_shard(pages, i, 3, content, "cost"))
+                 for i in range(1, 4)]
+        self.assertLess(max(loads) - min(loads), 120)
+
+    def test_merge(self):
+        a = os.path.join(self.root, "a")
+        b = os.path.join(self.root, "b")
+        self.write("a/index.html", "home")
+        self.write("a/index.css", "css")
+        self.write("b/blog/index.html", "blog")
+        self.write("b/index.css", "css")
+        self.write_manifest(a, {"index.html": "src/index.md", "index.css": "src/index.css"}, "1/2")
+        self.write_manifest(b, {"blog/index.html": "src/blog/index.md", "index.css": "src/index.css"}, "2/2")
+        dest = self.out
+        manifest = merge_shards([a, b], dest)
+        self.assertEqual(sorted(manifest["outputs"]), ["blog/index.html", "index.css", "index.html"])
+        with open(os.path.join(dest, "blog", "index.html")) as f:
+            self.assertEqual(f.read(), "blog")
+
+    def test_merge_collision(self):
+        a = os.path.join(self.root, "a")
+        b = os.path.join(self.root, "b")
+        self.write("a/index.html", "one")
+        self.write("b/index.html", "two")
+        self.write_manifest(a, {"index.html": "src/index.md"}, "1/2")
+        self.write_manifest(b, {"index.html": "src/index.md"}, "2/2")
+        with self.assertRaises(ValueError):
+            merge_shards([a, b], self.out)
+        self.assertFalse(os.path.exists(self.out))
+
+    def test_merge_into_a_shard_dir(self):
+        a = os.path.join(self.root, "a")
+        b = os.path.join(self.root, "b")
+        self.write("a/index.html", "home")
+        self.write("b/about.html", "about")
+        self.write_manifest(a, {"index.html": "src/index.md"}, "1/2")
+        self.write_manifest(b, {"about.html": "src/about.md"}, "2/2")
+        with self.assertRaises(ValueError):
+            merge_shards([a, b], os.path.join(self.root, ".", "a"))
+        # the shard's output is untouched
+        self.assertTrue(os.path.exists(os.path.join(a, "index.html")))
+
+    def test_merge_then_incremental_build(self):
+        self.write("template.html", "{{ Content }}")
+        self.write("static/index.css", "body {}")
+        self.write("content/index.md", "# Home")
+        self.write("content/contact/index.md", "# Contact")
+        for i in range(4):
+            self.write(f"content/blog/post{i}/index.md", f"---\ndate: 2024-01-0{i + 1}\n---\n# Post {i}")
+        shard_dirs = [os.path.join(self.root, "shard1"), os.path.join(self.root, "shard2")]
+        for i, shard_dir in enumerate(shard_dirs, 1):
+            self.build(shard=f"{i}/2", output_dir=shard_dir)
+        with redirect_stdout(StringIO()):
+            merge_site(self.config(), shard_dirs)
+        outputs = read_manifest(self.out)["outputs"]
+        self.assertIn("contact/index.html", outputs)
+        self.assertIn("index.css", outputs)
+        self.assertIn("feed.xml", outputs)
+
+        # the merged output directory builds incrementally from there
+        os.remove(os.path.join(self.root, "content", "contact", "index.md"))
+        log = self.build()
+        self.assertEqual(log.count("Generating page"), 0)
+        self.assertNotIn("Copying /", log)
+        self.assertFalse(os.path.exists(os.path.join(self.out, "contact")))
+
+
+if __name__ == "__main__":
+    unittest.main()
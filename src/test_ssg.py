@@ -0,0 +1,108 @@
+import os
+import sys
+import tempfile
+import subprocess
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+
+import ssg
+
+
+class TestLibraryAPI(unittest.TestCase):
+    def test_import_has_no_side_effects(self):
+        code = (
+            "import sys; import ssg; "
+            "print([m for m in ('main', 'inline_markdown', 'htmlnode', 'textnode') if m in sys.modules])"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=os.path.dirname(os.path.abspath(ssg.__file__)),
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        self.assertEqual(result.stdout.strip(), "[]")
+
+    def test_import_is_fast(self):
+        # importing the whole build pipeline takes ~100ms; the lazy facade
+        # should stay well under a millisecond, so this bound is generous
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", "import ssg"],
+            cwd=os.path.dirname(os.path.abspath(ssg.__file__)),
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        line = next(line for line in result.stderr.splitlines() if line.rstrip().endswith("| ssg"))
+        cumulative_us = int(line.split("|")[1])
+        self.assertLess(cumulative_us, 50000)
+
+    def test_render_markdown(self):
+        self.assertEqual(
+            ssg.render_markdown("# Hi\n\nsome _text_"),
+            "<div><h1>Hi</h1><p>some <i>text</i></p></div>",
+        )
+        self.assertEqual(ssg.render_markdown("---\nlayout: post\n---\n# Hi"), "<div><h1>Hi</h1></div>")
+
+    def test_render_many(self):
+        docs = (f"paragraph {i}" for i in range(3))
+        rendered = ssg.render_many(docs)
+        self.assertEqual(next(rendered), "<div><p>paragraph 0</p></div>")
+        self.assertEqual(len(list(rendered)), 2)
+        self.assertEqual(list(ssg.render_many(["---\ndate: 2024-01-01\n---\nbody"])), ["<div><p>body</p></div>"])
+
+    def test_build_site(self):
+        with tempfile.TemporaryDirectory() as root:
+            os.makedirs(os.path.join(root, "content", "blog"))
+            os.makedirs(os.path.join(root, "static"))
+            with open(os.path.join(root, "content", "blog", "index.md"), "w") as f:
+                f.write("# Blog\n\n[home](/)")
+            with open(os.path.join(root, "static", "index.css"), "w") as f:
+                f.write("body {}")
+            with open(os.path.join(root, "template.html"), "w") as f:
+                f.write("<title>{{ Title }}</title>{{ Content }}")
+            config = ssg.default_config(root)
+            config["basepath"] = "/site/"
+            config["search"] = False
+            config["blog"] = False
+            with redirect_stdout(StringIO()):
+                outputs = ssg.build_site(config)
+            self.assertEqual(sorted(outputs), ["blog/index.html", "index.css"])
+            with open(os.path.join(root, "docs", "blog", "index.html")) as f:
+                self.assertEqual(
+                    f.read(),
+                    '<title>Blog</title><div><h1>Blog</h1><p><a href="/site/">home</a></p></div>',
+                )
+
+    def test_build_in_memory(self):
+        with tempfile.TemporaryDirectory() as root:
+            os.makedirs(os.path.join(root, "content", "blog", "a"))
+            with open(os.path.join(root, "content", "index.md"), "w") as f:
+                f.write("# Home\n\n[a](/blog/a)")
+            with open(os.path.join(root, "content", "blog", "a", "index.md"), "w") as f:
+                f.write("# A")
+            with open(os.path.join(root, "template.html"), "w") as f:
+                f.write("{{ Content }}")
+            config = ssg.default_config(root)
+            with redirect_stdout(StringIO()):
+                site = ssg.build_in_memory(config)
+            self.assertFalse(os.path.exists(config["output_dir"]))
+            self.assertEqual(site.read("index.html"), '<div><h1>Home</h1><p><a href="/blog/a">a</a></p></div>')
+            self.assertIn("blog/a/index.html", site.files)
+            self.assertIn("feed.xml", site.files)
+            self.assertIn("search/docs.json", site.files)
+
+            # the state lives in the store, so rebuilding into it is incremental
+            with redirect_stdout(StringIO()) as log:
+                ssg.build_in_memory(config, site.files)
+            self.assertNotIn("Generating page", log.getvalue())
+
+            os.remove(os.path.join(root, "content", "blog", "a", "index.md"))
+            with redirect_stdout(StringIO()):
+                ssg.build_in_memory(config, site.files)
+            self.assertNotIn("blog/a/index.html", site.files)
+
+
+if __name__ == "__main__":
+    unittest.main()
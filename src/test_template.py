@@ -0,0 +1,68 @@
+import os
+import hashlib
+import tempfile
+import unittest
+
+from template import Template, load_template, write_chunks
+from urls import UrlResolver
+
+
+class TestTemplate(unittest.TestCase):
+    def test_render_streams_segments(self):
+        tpl = Template("<title>{{ Title }}</title><body>{{ Content }}</body>")
+        chunks = list(tpl.render("Hi", iter(["<p>", "x", "</p>"])))
+        self.assertEqual(chunks, ["<title>", "Hi", "</title><body>", "<p>", "x", "</p>", "</body>"])
+
+    def test_basepath_in_template(self):
+        tpl = Template(
+            '<link href="/index.css"><img src="/a.png"><a href="https://x.y/">{{ Content }}',
+            UrlResolver("repo"),
+        )
+        self.assertEqual(
+            "".join(tpl.render("", [])),
+            '<link href="/repo/index.css"><img src="/repo/a.png"><a href="https://x.y/">',
+        )
+
+    def test_repeated_content(self):
+        tpl = Template("{{ Content }}|{{ Content }}")
+        self.assertEqual("".join(tpl.render("", iter(["a", "b"]))), "ab|ab")
+
+    def test_write_chunks(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            dest = os.path.join(tmp, "a", "index.html")
+            digest = write_chunks(dest, iter(["<p>", "é", "</p>"]))
+            with open(dest, encoding="utf-8") as f:
+                self.assertEqual(f.read(), "<p>é</p>")
+            self.assertEqual(digest, hashlib.sha256("<p>é</p>".encode("utf-8")).hexdigest())
+
+
+    def test_includes(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            def write(name, text):
+                path = os.path.join(tmp, name)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with open(path, "w") as f:
+                    f.write(text)
+                return path
+
+            header = write("partials/header.html", '<a href="/">{{> nav.html }}</a>')
+            nav = write("partials/nav.html", "Home")
+            page = write("page.html", "{{> partials/header.html }}{{ Content }}")
+            tpl = load_template(page, "/repo/")
+            self.assertEqual("".join(tpl.render("", ["x"])), '<a href="/repo/">Home</a>x')
+            self.assertEqual(tpl.includes, [header, nav])
+            self.assertIs(load_template(page, "/repo/"), tpl)
+
+            # editing a nested partial recompiles the template
+            write("partials/nav.html", "Start")
+            os.utime(nav, ns=(1, 1))
+            self.assertEqual("".join(load_template(page, "/repo/").render("", [])), '<a href="/repo/">Start</a>')
+
+            write("partials/nav.html", "{{> header.html }}")
+            os.utime(nav, ns=(2, 2))
+            with self.assertRaises(ValueError):
+                load_template(page, "/repo/")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,36 @@
+import unittest
+
+from urls import UrlResolver, get_resolver, normalize_basepath
+from inline_markdown import markdown_to_html_node
+
+
+class TestUrlResolver(unittest.TestCase):
+    def test_normalize_basepath(self):
+        self.assertEqual(normalize_basepath("repo"), "/repo/")
+        self.assertEqual(normalize_basepath("/repo/"), "/repo/")
+
+    def test_resolve(self):
+        resolve = UrlResolver("/repo/")
+        self.assertEqual(resolve("/"), "/repo/")
+        self.assertEqual(resolve("/images/tom.png"), "/repo/images/tom.png")
+        self.assertEqual(resolve("https://boot.dev"), "https://boot.dev")
+        self.assertEqual(resolve("//cdn.example.com/x.js"), "//cdn.example.com/x.js")
+        self.assertEqual(resolve("#top"), "#top")
+
+    def test_root_basepath_is_identity(self):
+        self.assertEqual(UrlResolver("/")("/blog/"), "/blog/")
+
+    def test_shared_resolver(self):
+        self.assertIs(get_resolver("/a/"), get_resolver("/a/"))
+
+    def test_markdown_links_and_code(self):
+        md = '[home](/) ![tom](/images/tom.png)\n\n```\n<a href="/x">\n```'
+        html = markdown_to_html_node(md, UrlResolver("/repo/")).to_html()
+        self.assertIn('<a href="/repo/">home</a>', html)
+        self.assertIn('<img src="/repo/images/tom.png" alt="tom"></img>', html)
+        # code is not rewritten
+        self.assertIn('<a href="/x">', html)
+
+
+if __name__ == "__main__":
+    unittest.main()
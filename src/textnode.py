@@ -1,4 +1,4 @@
-from htmlnode import LeafNode
+from htmlnode import LeafNode, ParentNode
 from enum import Enum
 
 
@@ -9,6 +9,8 @@ class TextType(Enum):
     CODE = "code"
     LINK = "link"
     IMAGE = "image"
+    STRIKETHROUGH = "strikethrough"
+    FOOTNOTE = "footnote"
 
 
 class TextNode:
@@ -31,17 +33,32 @@ class TextNode:
         return f"TextNode({self.text}, {self.text_type.value}, {self.url})"
 
 
-def text_node_to_html_node(text_node):
-    if text_node.text_type == TextType.TEXT:
-        return LeafNode(None, text_node.text)
-    if text_node.text_type == TextType.BOLD:
-        return LeafNode("b", text_node.text)
-    if text_node.text_type == TextType.ITALIC:
-        return LeafNode("i", text_node.text)
-    if text_node.text_type == TextType.CODE:
-        return LeafNode("code", text_node.text)
-    if text_node.text_type == TextType.LINK:
-        return LeafNode("a", text_node.text, {"href": text_node.url})
-    if text_node.text_type == TextType.IMAGE:
-        return LeafNode("img", "", {"src": text_node.url, "alt": text_node.text})
-    raise ValueError(f"invalid text type: {text_node.text_type}")
+def _footnote_ref(text, url):
+    return ParentNode("sup", [LeafNode("a", text, {"href": f"#fn-{text}", "id": f"fnref-{text}"})])
+
+
+# builds the HTML node for each text type from (text, resolved url);
+# inline rules with their own text types add theirs here
+HTML_BUILDERS = {
+    TextType.TEXT: lambda text, url: LeafNode(None, text),
+    TextType.BOLD: lambda text, url: LeafNode("b", text),
+    TextType.ITALIC: lambda text, url: LeafNode("i", text),
+    TextType.CODE: lambda text, url: LeafNode("code", text),
+    TextType.STRIKETHROUGH: lambda text, url: LeafNode("del", text),
+    TextType.LINK: lambda text, url: LeafNode("a", text, {"href": url}),
+    TextType.IMAGE: lambda text, url: LeafNode("img", "", {"src": url, "alt": text}),
+    TextType.FOOTNOTE: _footnote_ref,
+}
+
+
+def text_node_to_html_node(text_node, resolve_url=None):
+    """
+    resolve_url, if given, maps link and image URLs (see urls.UrlResolver).
+    """
+    build = HTML_BUILDERS.get(text_node.text_type)
+    if build is None:
+        raise ValueError(f"invalid text type: {text_node.text_type}")
+    url = text_node.url
+    if url is not None and resolve_url is not None:
+        url = resolve_url(url)
+    return build(text_node.text, url)
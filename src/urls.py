@@ -0,0 +1,68 @@
+def normalize_basepath(basepath):
+    # Ensure basepath starts and ends with /
+    if not basepath.startswith('/'):
+        basepath = '/' + basepath
+    if not basepath.endswith('/'):
+        basepath = basepath + '/'
+    return basepath
+
+
+class UrlResolver:
+    """
+    Maps the URLs of links, images and template attributes to the URLs
+    they are served under. Root-relative URLs ("/blog/") are prefixed with
+    the basepath; absolute, protocol-relative ("//cdn") and relative URLs
+    pass through. With an assets.AssetMap, root-relative URLs of static
+    files are first mapped to their fingerprinted names. Results are
+    memoized per URL, since the same handful of links (home, stylesheet,
+    images) recur on every page.
+
+    cache_key covers the basepath only: caches of rendered HTML check the
+    asset URLs they contain themselves (see BlockCache), so renaming one
+    asset doesn't invalidate everything rendered before.
+    """
+
+    def __init__(self, basepath='/', assets=None):
+        self.basepath = normalize_basepath(basepath)
+        self.assets = assets
+        # identifies this resolver's output for caches of rendered HTML
+        self.cache_key = ("basepath", self.basepath)
+        self._cache = {}
+
+    def __call__(self, url):
+        resolved = self._cache.get(url)
+        if resolved is None:
+            resolved = self.resolve(url)
+            self._cache[url] = resolved
+        return resolved
+
+    def resolve(self, url):
+        if not url.startswith('/') or url.startswith('//'):
+            return url
+        if self.assets is not None:
+            # the query string or fragment stays as it is
+            end = len(url)
+            for c in '?#':
+                i = url.find(c)
+                if i != -1 and i < end:
+                    end = i
+            url = self.assets.url(url[:end]) + url[end:]
+        if self.basepath == '/':
+            return url
+        return self.basepath + url[1:]
+
+
+_resolvers = {}
+
+
+def get_resolver(basepath='/', assets=None):
+    """
+    Returns the shared resolver for basepath (and asset map), so its memo
+    persists across pages.
+    """
+    key = (basepath, assets.key if assets is not None else None)
+    resolver = _resolvers.get(key)
+    if resolver is None:
+        resolver = UrlResolver(basepath, assets)
+        _resolvers[key] = resolver
+    return resolver